@@ -33,8 +33,9 @@ from __future__ import annotations
 import argparse
 import sys
 import json
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterable, Iterator
 
 sys.path.append(str(Path(__file__).parent))
 
@@ -46,7 +47,6 @@ from lib.credentials import load_credential, save_credential, get_config, CREDEN
 SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 TOKEN_FILE = CREDENTIALS_DIR / "google-calendar-token.json"
 
-
 def get_calendar_service():
     """Build and return a Google Calendar API service object.
 
@@ -83,77 +83,90 @@ def get_calendar_service():
     return build("calendar", "v3", credentials=creds)
 
 
-def fetch_events(service, days: int = 7) -> list[dict]:
+def fetch_events(service, days: int = 7) -> Iterator[dict]:
     """Fetch upcoming events from Google Calendar.
 
+    Pages are requested lazily, so events can be consumed as each page
+    arrives rather than after the whole window has been fetched.
+
     Args:
         service: Google Calendar API service object.
         days: Number of days to look ahead.
 
-    Returns:
-        List of event dicts.
+    Yields:
+        Event dicts in start-time order.
     """
-    now = datetime.utcnow()
-    time_min = now.isoformat() + "Z"
-    time_max = (now + timedelta(days=days)).isoformat() + "Z"
-
-    events: list[dict] = []
-    page_token = None
-
-    while True:
-        events_result = (
-            service.events()
-            .list(
-                calendarId="primary",
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy="startTime",
-                pageToken=page_token,
-            )
-            .execute()
-        )
-        events.extend(events_result.get("items", []))
-        page_token = events_result.get("nextPageToken")
-        if not page_token:
-            break
-
-    return events
-
-
-def group_events_by_date(events: list[dict]) -> dict[str, list[dict]]:
-    """Group events by their start date."""
-    by_date = {}
+    # Aware UTC timestamps serialize as RFC 3339 ("+00:00") directly.
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    time_min = now.isoformat()
+    time_max = (now + timedelta(days=days)).isoformat()
+
+    events_api = service.events()
+    request = events_api.list(
+        calendarId="primary",
+        timeMin=time_min,
+        timeMax=time_max,
+        singleEvents=True,
+        orderBy="startTime",
+    )
+    while request is not None:
+        response = request.execute()
+        yield from response.get("items", [])
+        request = events_api.list_next(request, response)
+
+
+def group_events_by_date(
+    events: Iterable[dict],
+    dates: Iterable[str] | None = None,
+) -> dict[str, list[dict]]:
+    """Group events by their start date.
+
+    If dates is given, the result is preseeded with an empty list for each
+    date, in order, and events starting on any other date are dropped.
+    """
+    if dates is None:
+        by_date: dict[str, list[dict]] = {}
+        for event in events:
+            start_info = event["start"]
+            start = start_info.get("dateTime") or start_info.get("date") or ""
+            # Extract just the date portion
+            by_date.setdefault(start[:10], []).append(event)
+        return by_date
+
+    by_date = {day: [] for day in dates}
     for event in events:
-        start = event["start"].get("dateTime", event["start"].get("date", ""))
-        # Extract just the date portion
-        event_date = start[:10]
-        by_date.setdefault(event_date, []).append(event)
+        # The API sets exactly one of dateTime/date; `or` stops at the common one.
+        start_info = event["start"]
+        start = start_info.get("dateTime") or start_info.get("date") or ""
+        day_events = by_date.get(start[:10])
+        if day_events is not None:
+            day_events.append(event)
     return by_date
 
 
-def format_event(event: dict) -> str:
-    """Format a single event as a markdown list item."""
-    start = event["start"].get("dateTime", event["start"].get("date", ""))
+def format_event(event: dict, out: list[str]) -> None:
+    """Append a single event's markdown list item lines to out."""
+    start_info = event["start"]
+    start = start_info.get("dateTime") or start_info.get("date") or ""
     summary = event.get("summary", "(no title)")
-    location = event.get("location", "")
-    status = event.get("status", "confirmed")
-    organizer = event.get("organizer", {}).get("email", "")
 
     # Extract time if it's a timed event (not all-day)
     if "T" in start:
-        time_str = start[11:16]  # HH:MM
-        line = f"- **{time_str}** — {summary}"
+        line = f"- **{start[11:16]}** — {summary}"
     else:
         line = f"- *(all day)* — {summary}"
 
+    # Optional fields are absent on most events; look each up once with no
+    # default container so the common path allocates nothing extra.
+    location = event.get("location")
     if location:
         line += f" ({location})"
-    if status != "confirmed":
+    status = event.get("status")
+    if status and status != "confirmed":
         line += f" [{status}]"
+    out.append(line)
 
-    # Add attendees if present
-    attendees = event.get("attendees", [])
+    attendees = event.get("attendees")
     if attendees:
         names = [
             a.get("displayName", a.get("email", ""))
@@ -161,13 +174,33 @@ def format_event(event: dict) -> str:
             if not a.get("self", False)
         ]
         if names and len(names) <= 5:
-            line += f"\n  - With: {', '.join(names)}"
-    if organizer:
-        line += f"\n  - Organizer: {organizer}"
+            out.append(f"  - With: {', '.join(names)}")
+    organizer = event.get("organizer")
+    if organizer and organizer.get("email"):
+        out.append(f"  - Organizer: {organizer['email']}")
     if event.get("id"):
-        line += f"\n  - Event ID: {event['id']}"
+        out.append(f"  - Event ID: {event['id']}")
+
+
+def has_time_conflicts(events: list[dict]) -> bool:
+    """Return True if any two timed events overlap.
 
-    return line
+    Sweeps the (start, end) intervals in start order, tracking the latest
+    end seen so far. ISO-8601 strings from the API share the calendar's
+    timezone offset, so lexicographic comparison matches time order.
+    """
+    intervals = sorted(
+        (e["start"]["dateTime"], e.get("end", {}).get("dateTime", ""))
+        for e in events
+        if "T" in e["start"].get("dateTime", "")
+    )
+    max_end = ""
+    for start, end in intervals:
+        if start < max_end:
+            return True
+        if end > max_end:
+            max_end = end
+    return False
 
 
 def format_day(date_str: str, events: list[dict]) -> tuple[dict, str]:
@@ -176,18 +209,7 @@ def format_day(date_str: str, events: list[dict]) -> tuple[dict, str]:
     Returns:
         Tuple of (frontmatter_dict, body_string).
     """
-    # Check for time conflicts
-    timed_events = [
-        e for e in events if "T" in e["start"].get("dateTime", "")
-    ]
-    has_conflicts = False
-    for i, e1 in enumerate(timed_events):
-        for e2 in timed_events[i + 1 :]:
-            end1 = e1.get("end", {}).get("dateTime", "")
-            start2 = e2["start"].get("dateTime", "")
-            if end1 and start2 and end1 > start2:
-                has_conflicts = True
-                break
+    has_conflicts = has_time_conflicts(events)
 
     frontmatter = {
         "type": "calendar-day",
@@ -202,7 +224,7 @@ def format_day(date_str: str, events: list[dict]) -> tuple[dict, str]:
 
     body_lines = [f"# Calendar — {date_str}", ""]
     for event in events:
-        body_lines.append(format_event(event))
+        format_event(event, body_lines)
     body_lines.append("")
 
     if has_conflicts:
@@ -237,9 +259,13 @@ def main():
 
     logger.info(f"Fetching calendar events for next {args.days} days")
 
+    # Every day in range gets a file, including days with no events
+    today = date.today()
+    day_strs = [(today + timedelta(days=i)).isoformat() for i in range(args.days)]
+
     try:
         service = get_calendar_service()
-        events = fetch_events(service, args.days)
+        grouped = group_events_by_date(fetch_events(service, args.days), day_strs)
     except FileNotFoundError as e:
         logger.error(f"Credentials not found: {e}")
         logger.error("Run with --setup first, or see docstring for setup instructions.")
@@ -248,33 +274,37 @@ def main():
         logger.error(f"Failed to fetch calendar: {e}")
         sys.exit(1)
 
-    logger.info(f"Fetched {len(events)} events")
+    event_count = sum(len(day_events) for day_events in grouped.values())
+    logger.info(f"Fetched {event_count} events")
 
-    grouped = group_events_by_date(events)
     files_written = 0
 
-    # Also write empty files for days with no events (within range)
-    today = date.today()
-    for i in range(args.days):
-        day = today + timedelta(days=i)
-        day_str = day.isoformat()
-
-        day_events = grouped.get(day_str, [])
-        frontmatter, body = format_day(day_str, day_events)
-        filename = f"{day_str}.md"
-
-        path = writer.write_data_file(
-            folder="calendar",
-            filename=filename,
-            frontmatter=frontmatter,
-            body=body,
-            overwrite=True,
-        )
-        logger.info(f"Wrote {path} ({len(day_events)} events)")
-        files_written += 1
+    # batch() creates data/calendar once and writes every day file together
+    # when the block exits.
+    try:
+        with writer.batch():
+            for day_str, day_events in grouped.items():
+                frontmatter, body = format_day(day_str, day_events)
+                filename = f"{day_str}.md"
+
+                writer.write_data_file(
+                    folder="calendar",
+                    filename=filename,
+                    frontmatter=frontmatter,
+                    body=body,
+                    overwrite=True,
+                    skip_unchanged=True,
+                )
+                logger.info(f"Prepared {filename} ({len(day_events)} events)")
+                files_written += 1
+    except OSError as e:
+        logger.error(f"Failed to write calendar files: {e}")
+        sys.exit(1)
 
     state.touch_synced()
-    logger.info(f"Done. {files_written} calendar files written.")
+    # skip_unchanged leaves identical days untouched, so not every file counted
+    # here was rewritten
+    logger.info(f"Done. {files_written} calendar files up to date.")
 
 
 if __name__ == "__main__":
@@ -11,6 +11,11 @@ PREREQUISITES:
        Format: {"token": "your-token-here"}
     3. Run the adapter
 
+DEPENDENCIES:
+    None required. Optional:
+        pip install ijson   # streams the categories response
+        pip install orjson  # faster parsing of the other responses
+
 SECURITY:
     This adapter writes ONLY aggregated summaries (category totals, budget status).
     Individual transactions, account numbers, and balances are NEVER written to the vault.
@@ -19,12 +24,16 @@ SECURITY:
 from __future__ import annotations
 
 import argparse
+import http.client
 import sys
 import json
+import time
 from datetime import date, datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from urllib.request import urlopen, Request
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
 
 sys.path.append(str(Path(__file__).parent))
 
@@ -33,27 +42,95 @@ from lib.sync_state import SyncState
 from lib.logging_config import setup_logging
 from lib.credentials import load_credential, get_config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 YNAB_BASE = "https://api.ynab.com/v1"
+YNAB_RETRIES = 3
+BUDGET_ID_TTL = timedelta(days=7)
+MILLIUNITS = 1000  # YNAB reports currency amounts in milliunits
+SKIPPED_GROUPS = frozenset({"Internal Master Category", "Credit Card Payments"})
+
+
+def _load_json(resp):
+    """Parse a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        # orjson parses bytes directly, skipping the str decode.
+        return orjson.loads(resp.read())
+    return json.load(resp)
+
+
+def ynab_request(endpoint: str, token: str, parse=_load_json):
+    """Make an authenticated request to the YNAB API.
 
+    Connection failures and 429/5xx responses are retried with exponential
+    backoff; other HTTP errors raise HTTPError at once. When the retries
+    run out, the last error is raised.
 
-def ynab_request(endpoint: str, token: str) -> dict:
-    """Make an authenticated request to the YNAB API."""
+    Args:
+        endpoint: Path under the API base, e.g. "/budgets".
+        token: YNAB API token.
+        parse: Callable that reads the response file object and returns the
+            result. Defaults to a full JSON parse; streaming parsers can pass
+            their own.
+    """
     url = f"{YNAB_BASE}{endpoint}"
     req = Request(url, headers={
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
     })
-    with urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode("utf-8"))
 
+    for attempt in range(YNAB_RETRIES):
+        if attempt:
+            time.sleep(0.5 * 2 ** (attempt - 1))
+        try:
+            with urlopen(req, timeout=30) as resp:
+                return parse(resp)
+        except HTTPError as e:
+            if e.code != 429 and e.code < 500:
+                raise
+            error = e
+        except URLError as e:
+            error = e
+        except (http.client.HTTPException, OSError) as e:
+            # Dropped or timed-out connection while reading the body
+            error = URLError(e)
+
+    raise error
+
+
+def _budget_id_expired(expires_at) -> bool:
+    """Whether a cached budget ID's expiry has passed; unreadable values count as expired."""
+    try:
+        return datetime.fromisoformat(expires_at) <= datetime.now()
+    except (TypeError, ValueError):
+        return True
+
+
+def get_default_budget_id(token: str, state: SyncState | None = None) -> str:
+    """Get the first (default) budget ID.
+
+    When a SyncState is given, a budget ID cached by a previous run is reused
+    until its expiry so the /budgets round-trip is skipped. The caller is
+    responsible for saving the state.
+    """
+    if state is not None:
+        cached_id = state.get("budget_id")
+        if cached_id and not _budget_id_expired(state.get("budget_id_expires_at")):
+            return cached_id
 
-def get_default_budget_id(token: str) -> str:
-    """Get the first (default) budget ID."""
     data = ynab_request("/budgets", token)
     budgets = data.get("data", {}).get("budgets", [])
     if not budgets:
         raise ValueError("No budgets found in YNAB account")
-    return budgets[0]["id"]
+    budget_id = budgets[0]["id"]
+
+    if state is not None:
+        state.set("budget_id", budget_id)
+        state.set("budget_id_expires_at", (datetime.now() + BUDGET_ID_TTL).isoformat())
+    return budget_id
 
 
 def get_month_summary(token: str, budget_id: str, month: str) -> dict:
@@ -67,41 +144,106 @@ def get_month_summary(token: str, budget_id: str, month: str) -> dict:
     return ynab_request(f"/budgets/{budget_id}/months/{month}", token)
 
 
-def get_categories(token: str, budget_id: str) -> list[dict]:
-    """Get all budget categories with current month activity."""
-    data = ynab_request(f"/budgets/{budget_id}/categories", token)
-    groups = data.get("data", {}).get("category_groups", [])
+def _iter_category_groups(resp):
+    """Yield category groups from a /categories response one at a time.
 
+    Uses ijson, when installed, to stream groups straight off the socket
+    instead of materializing the whole payload; otherwise parses the full
+    body. A truncated or malformed stream raises ValueError, as the full
+    parse does.
+    """
+    try:
+        import ijson
+    except ImportError:
+        yield from _load_json(resp).get("data", {}).get("category_groups", [])
+        return
+    try:
+        yield from ijson.items(resp, "data.category_groups.item", use_float=True)
+    except ijson.JSONError as e:
+        raise ValueError(f"Malformed categories response: {e}") from e
+
+
+def _summarize_categories(groups) -> list[dict]:
     categories = []
     for group in groups:
-        if group.get("hidden", False) or group["name"] in ("Internal Master Category", "Credit Card Payments"):
+        group_name = group["name"]
+        if group.get("hidden", False) or group_name in SKIPPED_GROUPS:
             continue
         for cat in group.get("categories", []):
             if cat.get("hidden", False) or cat.get("deleted", False):
                 continue
             categories.append({
-                "group": group["name"],
+                "group": group_name,
                 "name": cat["name"],
-                "budgeted": cat.get("budgeted", 0) / 1000,  # YNAB uses milliunits
-                "activity": abs(cat.get("activity", 0)) / 1000,
-                "balance": cat.get("balance", 0) / 1000,
+                "budgeted": cat.get("budgeted", 0) / MILLIUNITS,
+                "activity": abs(cat.get("activity", 0)) / MILLIUNITS,
+                "balance": cat.get("balance", 0) / MILLIUNITS,
             })
-
     return categories
 
 
-def format_weekly_summary(categories: list[dict], week_start: date) -> tuple[dict, str]:
-    """Format category data into a weekly vault file."""
+def get_categories(token: str, budget_id: str) -> list[dict]:
+    """Get all budget categories with current month activity.
+
+    Only the summary fields are kept; each group is discarded as soon as it
+    has been reduced.
+    """
+    return ynab_request(
+        f"/budgets/{budget_id}/categories",
+        token,
+        parse=lambda resp: _summarize_categories(_iter_category_groups(resp)),
+    )
+
+
+def fetch_categories(token: str, state: SyncState | None = None) -> list[dict]:
+    """Fetch the default budget's categories.
+
+    If YNAB answers 404, the budget ID cached in state may belong to a
+    budget that was deleted or replaced, so it is dropped and looked up
+    again once before giving up.
+
+    Args:
+        token: YNAB API token
+        state: Optional SyncState caching the budget ID (see
+            get_default_budget_id). The caller is responsible for saving it.
+    """
+    budget_id = get_default_budget_id(token, state)
+    try:
+        return get_categories(token, budget_id)
+    except HTTPError as e:
+        if e.code != 404 or state is None:
+            raise
+    state.set("budget_id", None)
+    state.set("budget_id_expires_at", None)
+    return get_categories(token, get_default_budget_id(token, state))
+
+
+def format_weekly_summary(
+    categories: list[dict],
+    week_start: date,
+) -> tuple[dict, str]:
+    """Format category data into a weekly vault file.
+
+    Args:
+        categories: Category summaries from get_categories.
+        week_start: Monday of the reported week.
+    """
     week_end = week_start + timedelta(days=6)
     week_num = week_start.isocalendar()[1]
 
-    total_budgeted = sum(c["budgeted"] for c in categories)
-    total_activity = sum(c["activity"] for c in categories)
-
-    over_budget = [
-        c["name"] for c in categories
-        if c["activity"] > c["budgeted"] > 0
-    ]
+    # Single pass: totals, over-budget categories, and per-group totals
+    total_budgeted = 0.0
+    total_activity = 0.0
+    over_budget_cats: list[dict] = []
+    group_totals: dict[str, float] = {}
+    for cat in categories:
+        budgeted, activity = cat["budgeted"], cat["activity"]
+        total_budgeted += budgeted
+        total_activity += activity
+        if activity > budgeted > 0:
+            over_budget_cats.append(cat)
+        group_totals[cat["group"]] = group_totals.get(cat["group"], 0) + activity
+    over_budget = [c["name"] for c in over_budget_cats]
 
     frontmatter = {
         "type": "finance-weekly",
@@ -128,31 +270,27 @@ def format_weekly_summary(categories: list[dict], week_start: date) -> tuple[dic
     if over_budget:
         body_lines.append("## Over Budget")
         body_lines.append("")
-        for cat in categories:
-            if cat["name"] in over_budget:
-                over_by = cat["activity"] - cat["budgeted"]
-                pct = (cat["activity"] / cat["budgeted"] * 100) if cat["budgeted"] > 0 else 0
-                body_lines.append(
-                    f"- **{cat['name']}**: ${cat['activity']:,.2f} / ${cat['budgeted']:,.2f} "
-                    f"(+${over_by:,.2f}, {pct:.0f}%)"
-                )
+        for cat in over_budget_cats:
+            over_by = cat["activity"] - cat["budgeted"]
+            pct = cat["activity"] / cat["budgeted"] * 100
+            body_lines.append(
+                f"- **{cat['name']}**: ${cat['activity']:,.2f} / ${cat['budgeted']:,.2f} "
+                f"(+${over_by:,.2f}, {pct:.0f}%)"
+            )
         body_lines.append("")
 
     body_lines.append("## By Category Group")
     body_lines.append("")
 
-    # Group categories
-    groups = {}
-    for cat in categories:
-        groups.setdefault(cat["group"], []).append(cat)
-
-    for group_name, cats in sorted(groups.items()):
-        group_total = sum(c["activity"] for c in cats)
+    # One sort orders groups by name and categories by activity within each.
+    by_group = sorted(categories, key=lambda c: (c["group"], -c["activity"]))
+    for group_name, cats in groupby(by_group, key=itemgetter("group")):
+        group_total = group_totals[group_name]
         if group_total == 0:
             continue
         body_lines.append(f"### {group_name} (${group_total:,.2f})")
         body_lines.append("")
-        for cat in sorted(cats, key=lambda c: c["activity"], reverse=True):
+        for cat in cats:
             if cat["activity"] == 0:
                 continue
             status = ""
@@ -193,8 +331,7 @@ def main():
     logger.info("Fetching YNAB budget data")
 
     try:
-        budget_id = get_default_budget_id(token)
-        categories = get_categories(token, budget_id)
+        categories = fetch_categories(token, state)
     except (URLError, ValueError) as e:
         logger.error(f"Failed to fetch YNAB data: {e}")
         sys.exit(1)
@@ -29,13 +29,20 @@ DEPENDENCIES:
 from __future__ import annotations
 
 import argparse
-import base64
+import binascii
 import email.utils
+import functools
+import json
 import re
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
+from html.parser import HTMLParser
 from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Iterable, Iterator, Mapping
 
 sys.path.append(str(Path(__file__).parent))
 
@@ -56,24 +63,73 @@ sys.path = [p for p in sys.path
 if 'calendar' in sys.modules and 'adapters' in getattr(sys.modules['calendar'], '__file__', ''):
     del sys.modules['calendar']
 
+# Imported once here, after the path fix above; get_gmail_service() reports
+# a missing install when it is first needed.
+try:
+    import google_auth_httplib2
+    import httplib2
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from googleapiclient.discovery import build
+    _HAS_GOOGLE = True
+except ImportError:
+    _HAS_GOOGLE = False
+
 SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
 TOKEN_FILE = CREDENTIALS_DIR / "google-gmail-token.json"
 
 MAX_RESULTS = 200
+# Gmail accepts up to 100 calls per batch but rate-limits batches above ~50.
+GET_BATCH_SIZE = 50
+# Batches in flight at once; keeps well inside Gmail's per-user quota.
+MAX_CONCURRENT_BATCHES = 4
+# Worker threads for retrying individual messages.get calls.
+MAX_FETCH_WORKERS = 8
+# Gmail rejects or truncates queries past ~1500 chars; leave room for the rest.
+MAX_FROM_CLAUSE_LEN = 1000
+
+# Headers parse_message reads; all a metadata-only fetch asks for.
+METADATA_HEADERS = ["From", "Subject", "Date"]
+
+# Partial-response mask for format=full: the headers plus mimeType and body
+# data of parts nested three deep, which covers mixed > related >
+# alternative > text. Anything deeper is dropped server-side and reads as an
+# empty body.
+_PART = "mimeType,body/data"
+FULL_MESSAGE_FIELDS = (
+    "id,threadId,labelIds,"
+    "payload(mimeType,headers(name,value),body/data,"
+    f"parts({_PART},parts({_PART},parts({_PART}))))"
+)
+
+# Payloads of recently synced messages; bodies are immutable, so a message
+# still inside the sync window is only downloaded once.
+BODY_CACHE_PATH = Path.home() / ".cache" / "generous-ledger" / "gmail-bodies.json"
+BODY_CACHE_VERSION = 1
+
+# Service built by get_gmail_service(), reused for the rest of the process.
+_service = None
+
+# Per-thread HTTP clients for concurrent requests (see _worker_http).
+_thread_state = threading.local()
 
 
 def get_gmail_service():
     """Build and return a Gmail API service object.
 
     Handles OAuth 2.0 token refresh automatically.
-    Reuses the same client config as the Calendar adapter.
+    Reuses the same client config as the Calendar adapter. The service and
+    its keep-alive HTTP client are cached for the life of the process, so
+    every request on the main thread shares one TLS connection. The
+    discovery document is the copy bundled with googleapiclient, so
+    building the service makes no network request.
     """
-    try:
-        from google.oauth2.credentials import Credentials
-        from google_auth_oauthlib.flow import InstalledAppFlow
-        from google.auth.transport.requests import Request
-        from googleapiclient.discovery import build
-    except ImportError:
+    global _service
+    if _service is not None:
+        return _service
+
+    if not _HAS_GOOGLE:
         print("ERROR: Required packages not installed.")
         print("Run: pip install google-auth-oauthlib google-api-python-client")
         sys.exit(1)
@@ -97,7 +153,9 @@ def get_gmail_service():
         # Save tokens for next run
         TOKEN_FILE.write_text(creds.to_json())
 
-    return build("gmail", "v1", credentials=creds)
+    http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=30))
+    _service = build("gmail", "v1", http=http, cache_discovery=False, static_discovery=True)
+    return _service
 
 
 # ---------------------------------------------------------------------------
@@ -113,9 +171,15 @@ def load_known_contacts(vault_path: str) -> dict[str, str]:
 # Message fetching
 # ---------------------------------------------------------------------------
 
-def fetch_message_ids(service, query: str, max_results: int = MAX_RESULTS) -> list[str]:
+def fetch_message_ids(service, query: str, max_results: int = MAX_RESULTS, http=None) -> list[str]:
     """Fetch message IDs matching a Gmail search query.
 
+    Args:
+        service: Gmail API service object.
+        query: Gmail search query.
+        max_results: Maximum number of IDs to return.
+        http: HTTP client to send requests with; defaults to the service's own.
+
     Returns:
         List of message ID strings.
     """
@@ -129,7 +193,7 @@ def fetch_message_ids(service, query: str, max_results: int = MAX_RESULTS) -> li
             maxResults=min(100, max_results - len(message_ids)),
             pageToken=page_token,
         )
-        result = request.execute()
+        result = request.execute(http=http)
         message_ids.extend(m["id"] for m in result.get("messages", []))
         if len(message_ids) >= max_results:
             return message_ids[:max_results]
@@ -139,52 +203,227 @@ def fetch_message_ids(service, query: str, max_results: int = MAX_RESULTS) -> li
     return message_ids
 
 
-def fetch_messages(service, days: int, known_contacts: dict[str, str]) -> list[dict]:
+def _chunk_emails(emails: Iterable[str], max_len: int = MAX_FROM_CLAUSE_LEN) -> Iterator[list[str]]:
+    """Split emails into groups whose " OR "-joined length stays within max_len.
+
+    An address longer than max_len on its own still gets a group of one.
+    """
+    chunk: list[str] = []
+    length = 0
+    for addr in emails:
+        added = len(addr) + (4 if chunk else 0)
+        if chunk and length + added > max_len:
+            yield chunk
+            chunk, length = [], 0
+            added = len(addr)
+        chunk.append(addr)
+        length += added
+    if chunk:
+        yield chunk
+
+
+def fetch_messages(
+    service,
+    days: int,
+    known_contacts: Mapping[str, str],
+    body_needed: Callable[[dict], bool] | None = None,
+    body_cache: dict[str, dict] | None = None,
+) -> list[dict]:
     """Fetch messages from Gmail using two queries, deduplicating by ID.
 
     Query 1: category:primary newer_than:Nd -from:noreply
     Query 2: from:(<known contacts>) newer_than:Nd
 
+    Query 2 is split into several queries to stay under Gmail's query length
+    limit when there are many known contacts; those are then listed
+    concurrently, together with query 1.
+
     Args:
         service: Gmail API service object.
         days: Number of days to look back.
         known_contacts: Dict mapping email -> name.
+        body_needed: Optional predicate over a metadata-only message dict.
+            When given, headers are fetched for every message first and full
+            bodies only for messages it accepts; the rest are returned as
+            metadata (no body).
+        body_cache: Optional dict mapping message ID -> payload from earlier
+            syncs. Cached bodies are not downloaded again (message content
+            never changes; labels still come from a metadata fetch), and
+            newly downloaded payloads are added to it.
 
     Returns:
-        List of full message dicts.
+        List of message dicts, in query order.
     """
     # Query 1: Primary inbox, excluding noreply
-    primary_query = f"category:primary newer_than:{days}d -from:noreply"
-    primary_ids = fetch_message_ids(service, primary_query)
+    queries = [f"category:primary newer_than:{days}d -from:noreply"]
 
     # Query 2: Known contacts (may catch messages outside primary)
-    contact_ids: list[str] = []
-    if known_contacts:
-        # Build OR query for known contact emails
-        email_list = " OR ".join(known_contacts.keys())
-        contact_query = f"from:({email_list}) newer_than:{days}d"
-        contact_ids = fetch_message_ids(service, contact_query)
-
-    # Deduplicate by message ID
+    # Build OR queries for known contact emails
+    queries.extend(
+        f"from:({' OR '.join(chunk)}) newer_than:{days}d"
+        for chunk in _chunk_emails(known_contacts.keys())
+    )
+
+    if len(queries) <= 2:
+        id_lists = [fetch_message_ids(service, q) for q in queries]
+    else:
+        # The primary query's pages are listed alongside the contact chunks
+        # rather than before them
+        with ThreadPoolExecutor(max_workers=min(len(queries), MAX_FETCH_WORKERS)) as pool:
+            id_lists = list(pool.map(
+                lambda q: fetch_message_ids(service, q, http=_worker_http(service)),
+                queries,
+            ))
+
+    # Deduplicate by message ID, keeping query order
     seen: set[str] = set()
     unique_ids: list[str] = []
-    for msg_id in primary_ids + contact_ids:
-        if msg_id not in seen:
-            seen.add(msg_id)
-            unique_ids.append(msg_id)
-
-    # Fetch full message content for each unique ID
-    messages: list[dict] = []
-    for msg_id in unique_ids:
-        msg = (
-            service.users()
-            .messages()
-            .get(userId="me", id=msg_id, format="full")
-            .execute()
+    for ids in id_lists:
+        for msg_id in ids:
+            if msg_id not in seen:
+                seen.add(msg_id)
+                unique_ids.append(msg_id)
+
+    if body_needed is None and body_cache is None:
+        return fetch_full_messages(service, unique_ids)
+
+    messages = fetch_message_metadata(service, unique_ids)
+    wanted = {m["id"] for m in messages if body_needed is None or body_needed(m)}
+    payloads = body_cache if body_cache is not None else {}
+    full_ids = [m["id"] for m in messages if m["id"] in wanted and m["id"] not in payloads]
+    for msg in fetch_full_messages(service, full_ids):
+        payloads[msg["id"]] = msg.get("payload", {})
+    # Labels (read state) come from the fresh metadata, bodies from payloads
+    return [
+        {**m, "payload": payloads[m["id"]]} if m["id"] in wanted and m["id"] in payloads else m
+        for m in messages
+    ]
+
+
+def load_body_cache(path: Path = BODY_CACHE_PATH) -> dict[str, dict]:
+    """Load the message payloads saved by the previous sync, keyed by ID."""
+    try:
+        with path.open("rb") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != BODY_CACHE_VERSION:
+        return {}
+    return cache.get("payloads", {})
+
+
+def save_body_cache(payloads: dict[str, dict], path: Path = BODY_CACHE_PATH) -> None:
+    """Replace the saved payloads; readable only by the owner (they are mail)."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": BODY_CACHE_VERSION, "payloads": payloads}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The cache is an optimization; a read-only home just disables it.
+
+
+def _worker_http(service):
+    """Return an authorized httplib2.Http private to the calling thread.
+
+    httplib2.Http is not thread-safe, so each worker thread gets its own
+    client carrying the service's credentials.
+    """
+    http = getattr(_thread_state, "http", None)
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(
+            service._http.credentials, http=httplib2.Http(timeout=30)
         )
-        messages.append(msg)
+        _thread_state.http = http
+    return http
+
+
+def _batch_get(service, message_ids: list[str], **get_params) -> list[dict]:
+    """Run messages.get for each ID using batched HTTP requests.
+
+    Sends GET_BATCH_SIZE messages.get calls per round-trip instead of one,
+    with up to MAX_CONCURRENT_BATCHES batches in flight at once. Calls that
+    fail inside a batch (usually rate limiting) are retried individually on
+    a thread pool, so persistent errors still propagate to the caller.
+
+    Args:
+        service: Gmail API service object.
+        message_ids: IDs to fetch.
+        **get_params: Extra messages.get parameters (format, fields, ...).
+
+    Returns:
+        Message dicts in the same order as message_ids.
+    """
+    by_id: dict[str, dict] = {}
+    failed: list[str] = []
+
+    def on_response(request_id, response, exception):
+        if exception is None:
+            by_id[request_id] = response
+        else:
+            failed.append(request_id)
+
+    messages_api = service.users().messages()
+    batches = []
+    for start in range(0, len(message_ids), GET_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_response)
+        for msg_id in message_ids[start:start + GET_BATCH_SIZE]:
+            batch.add(
+                messages_api.get(userId="me", id=msg_id, **get_params),
+                request_id=msg_id,
+            )
+        batches.append(batch)
+
+    if len(batches) == 1:
+        batches[0].execute()
+    elif batches:
+        workers = min(MAX_CONCURRENT_BATCHES, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # list() re-raises the first batch-level error, if any
+            list(pool.map(lambda b: b.execute(http=_worker_http(service)), batches))
+
+    if failed:
+        def get_one(msg_id: str) -> tuple[str, dict]:
+            request = messages_api.get(userId="me", id=msg_id, **get_params)
+            return msg_id, request.execute(http=_worker_http(service))
+
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(failed))) as pool:
+            by_id.update(pool.map(get_one, failed))
+
+    return [by_id[msg_id] for msg_id in message_ids if msg_id in by_id]
 
-    return messages
+
+def fetch_full_messages(service, message_ids: list[str]) -> list[dict]:
+    """Fetch full message content (headers and body) in batches.
+
+    The response is trimmed to FULL_MESSAGE_FIELDS, so the dozens of headers
+    and attachment metadata this adapter never reads are not sent.
+
+    Returns:
+        Full message dicts in the same order as message_ids.
+    """
+    return _batch_get(service, message_ids, format="full", fields=FULL_MESSAGE_FIELDS)
+
+
+def fetch_message_metadata(service, message_ids: list[str]) -> list[dict]:
+    """Fetch only the ID, labels and the headers parse_message reads.
+
+    A metadata response is a couple of KB where a full one can run to
+    hundreds, so this is the cheap first pass before deciding which bodies
+    to download.
+
+    Returns:
+        Message dicts without body data, in the same order as message_ids.
+    """
+    return _batch_get(
+        service,
+        message_ids,
+        format="metadata",
+        metadataHeaders=METADATA_HEADERS,
+        fields="id,threadId,labelIds,payload/headers",
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -200,98 +439,160 @@ def get_header(msg: dict, name: str) -> str:
     return ""
 
 
+def get_headers(msg: dict) -> dict[str, str]:
+    """Map lowercased header names to values in one pass over the headers.
+
+    Like get_header, the first occurrence of a repeated header wins.
+    """
+    headers: dict[str, str] = {}
+    for h in msg.get("payload", {}).get("headers", []):
+        headers.setdefault(h["name"].lower(), h["value"])
+    return headers
+
+
+def parse_sender(from_header: str) -> tuple[str, str]:
+    """Parse a From header value with a single parseaddr call.
+
+    Returns:
+        Tuple of (display name falling back to the address, lowercased email).
+    """
+    name, addr = email.utils.parseaddr(from_header)
+    return name or addr, addr.lower()
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_date_header(date_header: str) -> datetime | None:
+    """Parse an RFC 2822 Date header, or return None if it is malformed.
+
+    Cached: messages in a thread or from one sender often repeat the same
+    header, and the returned datetimes are immutable.
+    """
+    try:
+        return email.utils.parsedate_to_datetime(date_header)
+    except Exception:
+        return None
+
+
 def extract_sender_email(from_header: str) -> str:
     """Extract bare email address from a From header value."""
-    _, addr = email.utils.parseaddr(from_header)
-    return addr.lower()
+    return parse_sender(from_header)[1]
 
 
 def extract_sender_name(from_header: str) -> str:
     """Extract display name from a From header value, falling back to email."""
-    name, addr = email.utils.parseaddr(from_header)
-    return name if name else addr
+    return parse_sender(from_header)[0]
 
 
-def extract_body_text(payload: dict) -> str:
-    """Recursively extract plain text body from a Gmail message payload.
+# base64url -> standard alphabet, for binascii.a2b_base64
+_B64URL_TABLE = bytes.maketrans(b"-_", b"+/")
+
+
+def _b64_utf8(data: str) -> str:
+    """Decode a base64url body part as UTF-8, replacing undecodable bytes.
 
-    Prefers text/plain parts. Falls back to text/html with tag stripping.
+    Decodes with binascii directly; the extra "==" makes unpadded parts
+    decode too (surplus padding is ignored). A malformed part decodes to
+    "" rather than failing the whole sync.
     """
-    mime_type = payload.get("mimeType", "")
-    body_data = payload.get("body", {}).get("data", "")
-
-    if mime_type == "text/plain" and body_data:
-        return base64.urlsafe_b64decode(body_data).decode("utf-8", errors="replace")
-
-    # Recurse into multipart
-    parts = payload.get("parts", [])
-    # First pass: look for text/plain
-    for part in parts:
-        if part.get("mimeType") == "text/plain":
-            data = part.get("body", {}).get("data", "")
-            if data:
-                return base64.urlsafe_b64decode(data).decode("utf-8", errors="replace")
-        # Recurse into nested multipart
-        nested = extract_body_text(part)
-        if nested:
-            return nested
-
-    # Second pass: fall back to text/html with tag stripping
-    for part in parts:
-        if part.get("mimeType") == "text/html":
-            data = part.get("body", {}).get("data", "")
-            if data:
-                html = base64.urlsafe_b64decode(data).decode("utf-8", errors="replace")
-                return strip_html_tags(html)
-
-    # Top-level text/html fallback
-    if mime_type == "text/html" and body_data:
-        html = base64.urlsafe_b64decode(body_data).decode("utf-8", errors="replace")
-        return strip_html_tags(html)
+    try:
+        raw = binascii.a2b_base64(data.encode("ascii").translate(_B64URL_TABLE) + b"==")
+    except ValueError:  # binascii.Error, or non-ASCII input
+        return ""
+    return raw.decode("utf-8", errors="replace")
 
-    return ""
+
+def extract_body_text(payload: dict) -> str:
+    """Extract the plain text body from a Gmail message payload.
+
+    Walks the MIME tree once, depth-first in document order, and returns the
+    first text/plain part with data. Falls back to the first text/html part
+    with tag stripping.
+    """
+    stack = [payload]
+    html_data = None
+    while stack:
+        part = stack.pop()
+        mime_type = part.get("mimeType", "")
+        body = part.get("body")
+        data = body.get("data") if body else None
+        if data:
+            if mime_type == "text/plain":
+                return _b64_utf8(data)
+            if mime_type == "text/html" and html_data is None:
+                html_data = data
+        parts = part.get("parts")
+        if parts:
+            stack.extend(reversed(parts))
+
+    if html_data is None:
+        return ""
+    return strip_html_tags(_b64_utf8(html_data))
+
+
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collect the text of an HTML document in a single tokenizing pass."""
+
+    BLOCK_TAGS = frozenset({"p", "div", "tr", "li", "h1", "h2", "h3", "h4", "h5", "h6"})
+    SKIP_TAGS = frozenset({"script", "style"})
+
+    def __init__(self):
+        # convert_charrefs decodes every named and numeric entity in data
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "br":
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
 
 
 def strip_html_tags(html: str) -> str:
     """Rough HTML-to-text conversion for email bodies."""
-    # Remove style and script blocks
-    text = re.sub(r"<(style|script)[^>]*>.*?</\1>", "", html, flags=re.DOTALL | re.IGNORECASE)
-    # Replace <br> and block elements with newlines
-    text = re.sub(r"<br[^>]*>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</(p|div|tr|li|h[1-6])>", "\n", text, flags=re.IGNORECASE)
-    # Strip remaining tags
-    text = re.sub(r"<[^>]+>", "", text)
-    # Decode common HTML entities
-    text = text.replace("&nbsp;", " ").replace("&amp;", "&")
-    text = text.replace("&lt;", "<").replace("&gt;", ">")
-    text = text.replace("&quot;", '"').replace("&#39;", "'")
+    parser = _HTMLTextExtractor()
+    parser.feed(html)
+    parser.close()
+    text = "".join(parser.parts).replace("\xa0", " ")
     # Collapse excessive blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
 
-def parse_message(msg: dict, known_contacts: dict[str, str]) -> dict:
+def parse_message(msg: dict, known_contacts: Mapping[str, str]) -> dict:
     """Parse a Gmail API message into a structured dict.
 
     Returns:
         Dict with keys: id, thread_id, from_name, from_email, subject,
         date, date_str, labels, body, is_unread, is_known_contact.
     """
-    from_header = get_header(msg, "From")
-    from_email = extract_sender_email(from_header)
-    from_name = extract_sender_name(from_header)
-    subject = get_header(msg, "Subject") or "(no subject)"
-    date_header = get_header(msg, "Date")
-    labels = msg.get("labelIds", [])
+    headers = get_headers(msg)
+    from_header = headers.get("from", "")
+    from_name, from_email = parse_sender(from_header)
+    contact_name = known_contacts.get(from_email)
+    subject = headers.get("subject") or "(no subject)"
+    date_header = headers.get("date", "")
+    # A handful of label names repeat across every message; share one copy.
+    # This only holds because main parses every message in this process:
+    # strings unpickled from other processes would be separate objects.
+    labels = [sys.intern(label) for label in msg.get("labelIds", [])]
     body = extract_body_text(msg.get("payload", {}))
 
-    # Parse date
-    parsed_date = None
-    if date_header:
-        try:
-            parsed_date = email.utils.parsedate_to_datetime(date_header)
-        except Exception:
-            pass
+    parsed_date = parse_date_header(date_header) if date_header else None
 
     return {
         "id": msg.get("id", ""),
@@ -304,31 +605,47 @@ def parse_message(msg: dict, known_contacts: dict[str, str]) -> dict:
         "labels": labels,
         "body": body.strip(),
         "is_unread": "UNREAD" in labels,
-        "is_known_contact": from_email in known_contacts,
-        "contact_name": known_contacts.get(from_email, ""),
+        "is_known_contact": contact_name is not None,
+        "contact_name": contact_name or "",
     }
 
 
+def message_day(msg: dict) -> str:
+    """Return the YYYY-MM-DD day file a parsed message belongs in.
+
+    Messages without a parseable Date header are filed under today.
+    """
+    if msg["date"]:
+        return msg["date"].strftime("%Y-%m-%d")
+    return date.today().isoformat()
+
+
 # ---------------------------------------------------------------------------
 # Formatting
 # ---------------------------------------------------------------------------
 
+def _date_sort_key(msg: dict) -> tuple[bool, float]:
+    date = msg["date"]
+    return (date is not None, date.timestamp() if date is not None else 0.0)
+
+
 def group_by_sender(messages: list[dict]) -> dict[str, list[dict]]:
-    """Group parsed messages by sender email, preserving thread order."""
-    by_sender: dict[str, list[dict]] = {}
-    for msg in messages:
-        key = msg["from_email"]
-        by_sender.setdefault(key, []).append(msg)
-    # Sort each sender's messages by date
-    for msgs in by_sender.values():
-        msgs.sort(key=lambda m: m["date"] or datetime.min)
+    """Group parsed messages by sender email, each sender's sorted by date.
+
+    Senders keep first-seen order. Messages are sorted once up front; the
+    sort is stable, so every bucket comes out date-ordered without a
+    per-sender sort. Undated messages sort first; the key compares
+    timestamps because the sort spans every sender, and a tz-aware date
+    cannot be compared with a naive placeholder.
+    """
+    by_sender: dict[str, list[dict]] = {msg["from_email"]: [] for msg in messages}
+    for msg in sorted(messages, key=_date_sort_key):
+        by_sender[msg["from_email"]].append(msg)
     return by_sender
 
 
-def format_message(msg: dict) -> str:
-    """Format a single parsed message as markdown."""
-    lines: list[str] = []
-
+def _emit_message(msg: dict, lines: list[str]) -> None:
+    """Append a single parsed message's markdown lines to lines."""
     status = " (unread)" if msg["is_unread"] else ""
     contact_tag = f" [known contact: {msg['contact_name']}]" if msg["is_known_contact"] else ""
 
@@ -351,6 +668,11 @@ def format_message(msg: dict) -> str:
         lines.append("*(no text content)*")
     lines.append("")
 
+
+def format_message(msg: dict) -> str:
+    """Format a single parsed message as markdown."""
+    lines: list[str] = []
+    _emit_message(msg, lines)
     return "\n".join(lines)
 
 
@@ -360,8 +682,14 @@ def format_day(date_str: str, messages: list[dict]) -> tuple[dict, str]:
     Returns:
         Tuple of (frontmatter_dict, body_string).
     """
-    unread_count = sum(1 for m in messages if m["is_unread"])
-    known_count = sum(1 for m in messages if m["is_known_contact"])
+    # One pass for all the frontmatter counts
+    unread_count = known_count = 0
+    thread_ids: set[str] = set()
+    for m in messages:
+        unread_count += m["is_unread"]
+        known_count += m["is_known_contact"]
+        if m.get("thread_id"):
+            thread_ids.add(m["thread_id"])
 
     frontmatter = {
         "type": "email-daily",
@@ -369,7 +697,7 @@ def format_day(date_str: str, messages: list[dict]) -> tuple[dict, str]:
         "message_count": len(messages),
         "unread_count": unread_count,
         "known_contact_messages": known_count,
-        "thread_count": len({m["thread_id"] for m in messages if m.get("thread_id")}),
+        "thread_count": len(thread_ids),
         "max_results": MAX_RESULTS,
         "source": "gmail",
         "last_synced": datetime.now().isoformat(),
@@ -389,9 +717,10 @@ def format_day(date_str: str, messages: list[dict]) -> tuple[dict, str]:
     def sender_sort_key(item: tuple[str, list[dict]]) -> tuple[int, str]:
         sender_email, msgs = item
         is_known = 0 if msgs[0]["is_known_contact"] else 1
-        # Sort by most recent message date descending
-        latest = max((m["date"] for m in msgs if m["date"]), default=datetime.min)
-        return (is_known, latest.isoformat() if latest != datetime.min else "")
+        # Buckets are already date-sorted with undated messages first, so the
+        # last message carries the latest date (or None if none are dated).
+        latest = msgs[-1]["date"]
+        return (is_known, latest.isoformat() if latest else "")
 
     sorted_senders = sorted(by_sender.items(), key=sender_sort_key)
 
@@ -405,7 +734,7 @@ def format_day(date_str: str, messages: list[dict]) -> tuple[dict, str]:
         body_lines.append("")
 
         for msg in msgs:
-            body_lines.append(format_message(msg))
+            _emit_message(msg, body_lines)
 
         body_lines.append("---")
         body_lines.append("")
@@ -452,7 +781,8 @@ def main():
         sys.exit(1)
 
     # Load known contacts from profile/people/ files
-    known_contacts = load_known_contacts(vault_path)
+    # Read-only view: the contacts are shared by every parse and fetch worker
+    known_contacts = MappingProxyType(load_known_contacts(vault_path))
     if known_contacts:
         logger.info(f"Loaded {len(known_contacts)} known contact email(s)")
     else:
@@ -460,9 +790,19 @@ def main():
 
     logger.info(f"Fetching Gmail messages for past {args.days} day(s)")
 
+    # newer_than:Nd can reach past the oldest day written below; only
+    # download bodies for messages that will land in a written file.
+    today = date.today()
+    day_strs = {(today - timedelta(days=i)).isoformat() for i in range(args.days)}
+
+    def body_needed(msg: dict) -> bool:
+        return message_day(parse_message(msg, known_contacts)) in day_strs
+
+    body_cache = load_body_cache()
+
     try:
         service = get_gmail_service()
-        raw_messages = fetch_messages(service, args.days, known_contacts)
+        raw_messages = fetch_messages(service, args.days, known_contacts, body_needed, body_cache)
     except FileNotFoundError as e:
         logger.error(f"Credentials not found: {e}")
         logger.error("Run with --setup first, or see docstring for setup instructions.")
@@ -472,6 +812,8 @@ def main():
         sys.exit(1)
 
     logger.info(f"Fetched {len(raw_messages)} messages")
+    # Keep only the bodies of messages still inside the sync window
+    save_body_cache({m["id"]: body_cache[m["id"]] for m in raw_messages if m["id"] in body_cache})
 
     # Parse all messages
     parsed = [parse_message(msg, known_contacts) for msg in raw_messages]
@@ -479,16 +821,11 @@ def main():
     # Group by date
     by_date: dict[str, list[dict]] = {}
     for msg in parsed:
-        if msg["date"]:
-            msg_date = msg["date"].strftime("%Y-%m-%d")
-        else:
-            msg_date = date.today().isoformat()
-        by_date.setdefault(msg_date, []).append(msg)
+        by_date.setdefault(message_day(msg), []).append(msg)
 
     files_written = 0
 
     # Write a file for each day in the range
-    today = date.today()
     for i in range(args.days):
         day = today - timedelta(days=i)
         day_str = day.isoformat()
@@ -28,6 +28,7 @@ import struct
 import sys
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from typing import NamedTuple
 
 sys.path.append(str(Path(__file__).parent))
 
@@ -41,6 +42,87 @@ from lib.contact_index import load_message_contacts, normalize_phone as shared_n
 CORE_DATA_EPOCH = 978307200
 
 CHAT_DB_PATH = Path.home() / "Library" / "Messages" / "chat.db"
+# Bytes of chat.db SQLite may memory-map (256 MB).
+CHAT_DB_MMAP_SIZE = 256 * 1024 * 1024
+
+# Recent non-reaction messages with their chat and sender handle, each
+# flagged with whether its conversation is known (see group_messages_by_conversation).
+# is_known_handle() is registered per call by fetch_messages. A group chat is
+# known for a day if it is named or a known participant wrote in it that day.
+# Groups are keyed like group_messages_by_conversation keys them (by
+# chat_identifier, not chat ROWID), so SMS and iMessage rows of one group
+# are classified together.
+_FETCH_SQL = """
+    WITH recent AS (
+        SELECT
+            m.text,
+            m.attributedBody,
+            m.is_from_me,
+            m.date AS msg_date,
+            m.service,
+            h.id AS handle_id,
+            c.chat_identifier,
+            COALESCE(NULLIF(c.chat_identifier, ''), NULLIF(h.id, ''), 'unknown-group') AS group_key,
+            c.display_name AS chat_display_name,
+            c.style AS chat_style,
+            date(
+                CASE WHEN m.date > 1000000000000 THEN m.date / 1e9 ELSE m.date END
+                    + 978307200,
+                'unixepoch', 'localtime'
+            ) AS day,
+            is_known_handle(h.id) AS handle_known
+        FROM message m
+        -- A message can be joined to more than one chat; take the lowest
+        -- chat ID so each message yields exactly one row.
+        LEFT JOIN chat c ON c.ROWID = (
+            SELECT MIN(cmj.chat_id) FROM chat_message_join cmj
+            WHERE cmj.message_id = m.ROWID
+        )
+        LEFT JOIN handle h ON h.ROWID = m.handle_id
+        WHERE m.date > ?
+          AND m.associated_message_type = 0
+    ),
+    known_groups AS (
+        SELECT DISTINCT day, group_key
+        FROM recent
+        WHERE chat_style = 43
+          AND (chat_display_name <> '' OR (NOT is_from_me AND handle_known))
+    )
+    SELECT
+        r.text,
+        r.attributedBody,
+        r.is_from_me,
+        r.msg_date,
+        r.service,
+        r.handle_id,
+        r.chat_identifier,
+        r.chat_display_name,
+        r.chat_style,
+        r.day,
+        CASE WHEN r.chat_style = 43 THEN kg.group_key IS NOT NULL
+             ELSE r.handle_known END AS known
+    FROM recent r
+    LEFT JOIN known_groups kg ON kg.day = r.day AND kg.group_key = r.group_key
+    ORDER BY r.msg_date ASC
+"""
+
+
+class Message(NamedTuple):
+    """One chat.db message, as returned by fetch_messages.
+
+    A tuple rather than a dict keeps per-message memory small on large
+    syncs; fields are read by attribute.
+    """
+
+    handle_id: str
+    text: str
+    is_from_me: bool
+    timestamp: datetime | None
+    service: str
+    chat_id: str
+    chat_display_name: str
+    is_group: bool
+    day: str = ""  # local YYYY-MM-DD the message is filed under
 
 
 # ---------------------------------------------------------------------------
@@ -51,7 +133,8 @@ def open_chat_db() -> sqlite3.Connection:
     """Open chat.db in read-only mode.
 
     Returns:
-        SQLite connection in read-only mode.
+        SQLite connection in read-only mode. Rows are returned as plain
+        tuples.
 
     Raises:
         SystemExit: If the database is not found or not readable.
@@ -63,10 +146,18 @@ def open_chat_db() -> sqlite3.Connection:
 
     db_uri = f"file:{CHAT_DB_PATH}?mode=ro"
     try:
-        conn = sqlite3.connect(db_uri, uri=True)
-        conn.row_factory = sqlite3.Row
-        # Quick sanity check
-        conn.execute("SELECT COUNT(*) FROM message LIMIT 1")
+        conn = sqlite3.connect(db_uri, uri=True, cached_statements=256, isolation_level=None)
+        # Tuned for one large read-only scan: refuse writes outright, map the
+        # file instead of read()ing pages, and give sorts a 64 MB cache in RAM.
+        # journal_mode is left alone since the database is opened mode=ro.
+        conn.executescript(
+            "PRAGMA query_only=1;"
+            f"PRAGMA mmap_size={CHAT_DB_MMAP_SIZE};"
+            "PRAGMA cache_size=-65536;"
+            "PRAGMA temp_store=MEMORY;"
+        )
+        # Quick sanity check: touches the table without counting every row
+        conn.execute("SELECT 1 FROM message LIMIT 1")
         return conn
     except sqlite3.OperationalError as e:
         error_msg = str(e).lower()
@@ -97,9 +188,12 @@ def convert_timestamp(raw: int | float | None) -> datetime | None:
     if raw is None or raw == 0:
         return None
 
-    # Defensive: if value > 1e12, treat as nanoseconds; otherwise seconds
-    if raw > 1e12:
-        unix_ts = (raw / 1e9) + CORE_DATA_EPOCH
+    # Defensive: if value > 1e12, treat as nanoseconds; otherwise seconds.
+    # Whole seconds are split off in integer arithmetic, so only the
+    # sub-second remainder goes through a float division.
+    if raw > 1_000_000_000_000:
+        seconds, nanos = divmod(raw, 1_000_000_000)
+        unix_ts = CORE_DATA_EPOCH + seconds + (nanos / 1e9 if nanos else 0)
     else:
         unix_ts = raw + CORE_DATA_EPOCH
 
@@ -109,6 +203,27 @@ def convert_timestamp(raw: int | float | None) -> datetime | None:
         return None
 
 
+# First printable ASCII byte or UTF-8 lead byte after a class marker.
+_TEXT_START_RE = re.compile(rb"[\x20-\x7e\xc0-\xff]")
+# Control characters and U+FFFD left over from decoding a blob fragment.
+_CTRL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffd]+")
+# Runs of two or more printable characters in a raw blob: printable ASCII or
+# a well-formed UTF-8 sequence for U+00A0 and up. Stray bytes that are not
+# valid UTF-8 end a run.
+_PRINTABLE_RE = re.compile(
+    rb"(?:[\x20-\x7e]"
+    rb"|\xc2[\xa0-\xbf]|[\xc3-\xdf][\x80-\xbf]"
+    rb"|[\xe0-\xef][\x80-\xbf]{2}"
+    rb"|[\xf0-\xf4][\x80-\xbf]{3}){2,}"
+)
+# Class names and archive headers that are never the message text.
+_METADATA_RUNS = frozenset({
+    b"NSString", b"NSDictionary", b"NSMutableString",
+    b"NSObject", b"NSAttributedString", b"NSMutableAttributedString",
+    b"streamtyped", b"NSValue", b"NSNumber",
+})
+
+
 def decode_attributed_body(blob: bytes | None) -> str:
     """Extract plain text from an attributedBody binary blob.
 
@@ -131,129 +246,125 @@ def decode_attributed_body(blob: bytes | None) -> str:
 
     # Strategy 1: Look for NSString marker and extract text after it
     # The pattern is: NSString followed by a length byte and then the text
-    for marker in [b"NSString", b"NSDictionary"]:
+    # Positions are searched in place in raw; only the winning text is sliced.
+    for marker in (b"NSString", b"NSDictionary"):
         idx = raw.find(marker)
         if idx == -1:
             continue
 
-        # Skip past the marker and look for text
-        after = raw[idx + len(marker):]
-        # Find the start of readable text: skip control bytes until we hit
-        # a printable ASCII or UTF-8 character
-        text_start = 0
-        for i, byte in enumerate(after):
-            if 0x20 <= byte < 0x7F or byte >= 0xC0:
-                text_start = i
-                break
-
-        if text_start > 0:
-            # Extract until we hit a run of control characters
-            candidate = after[text_start:]
-            # Find the end: look for null bytes or runs of non-printable chars
-            end = len(candidate)
-            null_idx = candidate.find(b"\x00")
-            if null_idx > 0:
-                end = null_idx
-
-            try:
-                text = candidate[:end].decode("utf-8", errors="replace").strip()
-                # Clean up replacement characters and control chars
-                text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffd]+", "", text)
-                if len(text) > 1:
-                    return text
-            except Exception:
-                continue
+        # Skip past the marker and look for text: skip control bytes until
+        # we hit a printable ASCII or UTF-8 lead byte
+        after = idx + len(marker)
+        match = _TEXT_START_RE.search(raw, after)
+        if match is None or match.start() == after:
+            continue
+        text_start = match.start()
+
+        # Extract until the next null byte, or the end of the blob
+        end = raw.find(b"\x00", text_start)
+        if end == -1:
+            end = len(raw)
+
+        text = raw[text_start:end].decode("utf-8", errors="replace").strip()
+        # Clean up replacement characters and control chars
+        text = _CTRL_RE.sub("", text)
+        if len(text) > 1:
+            return text
 
     # Strategy 2: Decode as streamtyped — find readable text between control chars
-    # Look for the longest run of printable text in the blob
-    try:
-        decoded = raw.decode("utf-8", errors="replace")
-        # Find runs of printable characters (including common punctuation and spaces)
-        runs = re.findall(r"[\x20-\x7E\u00A0-\uFFFF]{2,}", decoded)
-        if runs:
-            # Filter out known metadata strings
-            skip_patterns = {
-                "NSString", "NSDictionary", "NSMutableString",
-                "NSObject", "NSAttributedString", "NSMutableAttributedString",
-                "streamtyped", "NSValue", "NSNumber",
-            }
-            candidates = [
-                r for r in runs
-                if r not in skip_patterns and len(r) > 1
-            ]
-            if candidates:
-                # Return the longest candidate as the most likely message text
-                return max(candidates, key=len).strip()
-    except Exception:
-        pass
-
-    return ""
-
-
-def fetch_messages(conn: sqlite3.Connection, days: int) -> list[dict]:
+    # Look for the longest run of printable text in the blob, skipping known
+    # metadata strings. Runs are found in the raw bytes; only the winner is
+    # decoded. The length check comes first so most runs never hash.
+    best = b""
+    for run in _PRINTABLE_RE.findall(raw):
+        if len(run) > len(best) and run not in _METADATA_RUNS:
+            best = run
+    return best.decode("utf-8", errors="replace").strip()
+
+
+def cutoff_timestamp(days: int) -> int:
+    """Return the Core Data nanosecond timestamp for `days` days ago."""
+    cutoff_dt = datetime.now() - timedelta(days=days)
+    return int((cutoff_dt.timestamp() - CORE_DATA_EPOCH) * 1e9)
+
+
+def count_recent_messages(conn: sqlite3.Connection, days: int) -> int:
+    """Count messages newer than the cutoff using only the message.date index.
+
+    Run before fetch_messages, this also pulls the index range the main
+    query scans into SQLite's mmap/page cache on a cold start.
+    """
+    return conn.execute(
+        "SELECT COUNT(*) FROM message WHERE date > ?", (cutoff_timestamp(days),)
+    ).fetchone()[0]
+
+
+def fetch_messages(
+    conn: sqlite3.Connection,
+    days: int,
+    known_contacts: dict[str, str] | None = None,
+) -> list[Message]:
     """Fetch recent messages from chat.db.
 
+    With known_contacts, the query flags which rows belong to known
+    conversations and only those have their attributedBody decoded. Rows
+    from unknown conversations only feed the day's counts, so they keep the
+    plain text column (possibly empty) and are returned whenever they have
+    any text or attributedBody at all.
+
     Args:
         conn: SQLite connection to chat.db.
         days: Number of days to look back.
+        known_contacts: Dict from load_known_contacts, or None to decode
+            every message.
 
     Returns:
-        List of message dicts with keys: handle_id, text, is_from_me,
-        timestamp, service, chat_id, chat_display_name, is_group.
-    """
-    # Calculate the cutoff timestamp in Core Data nanoseconds
-    cutoff_dt = datetime.now() - timedelta(days=days)
-    cutoff_unix = cutoff_dt.timestamp()
-    cutoff_core_data_ns = int((cutoff_unix - CORE_DATA_EPOCH) * 1e9)
-
-    query = """
-        SELECT
-            m.ROWID,
-            m.text,
-            m.attributedBody,
-            m.is_from_me,
-            m.date AS msg_date,
-            m.associated_message_type,
-            m.service,
-            h.id AS handle_id,
-            c.ROWID AS chat_rowid,
-            c.chat_identifier,
-            c.display_name AS chat_display_name,
-            c.style AS chat_style
-        FROM message m
-        LEFT JOIN chat_message_join cmj ON cmj.message_id = m.ROWID
-        LEFT JOIN chat c ON c.ROWID = cmj.chat_id
-        LEFT JOIN handle h ON h.ROWID = m.handle_id
-        WHERE m.date > ?
-          AND m.associated_message_type = 0
-        ORDER BY m.date ASC
+        List of Message tuples in date order. day is the local YYYY-MM-DD
+        computed in SQL; timestamp is None for messages outside known
+        conversations.
     """
+    cutoff_core_data_ns = cutoff_timestamp(days)
+
+    decode_all = known_contacts is None
+    today = date.today().isoformat()
+    contacts = known_contacts or {}
+    conn.create_function(
+        "is_known_handle", 1,
+        lambda handle: match_contact(handle, contacts) is not None,
+        deterministic=True,
+    )
 
-    rows = conn.execute(query, (cutoff_core_data_ns,)).fetchall()
-    messages: list[dict] = []
-
-    for row in rows:
-        # Extract text, falling back to attributedBody
-        text = row["text"] or ""
-        if not text.strip():
-            text = decode_attributed_body(row["attributedBody"])
-
-        if not text.strip():
-            continue  # Skip messages with no extractable text
-
-        timestamp = convert_timestamp(row["msg_date"])
-        is_group = (row["chat_style"] or 0) == 43  # 43 = group chat
+    messages: list[Message] = []
+
+    # Iterate the cursor directly rather than materializing every row first.
+    # Rows are plain tuples, unpacked in _FETCH_SQL's column order.
+    for (
+        text, attributed_body, is_from_me, msg_date, service, handle_id,
+        chat_identifier, chat_display_name, chat_style, day, known,
+    ) in conn.execute(_FETCH_SQL, (cutoff_core_data_ns,)):
+        text = text or ""
+        if decode_all or known:
+            # Extract text, falling back to attributedBody
+            if not text.strip():
+                text = decode_attributed_body(attributed_body)
+            if not text.strip():
+                continue  # Skip messages with no extractable text
+        elif not text.strip() and not attributed_body:
+            continue
 
-        messages.append({
-            "handle_id": row["handle_id"] or "",
-            "text": text.strip(),
-            "is_from_me": bool(row["is_from_me"]),
-            "timestamp": timestamp,
-            "service": row["service"] or "iMessage",
-            "chat_id": row["chat_identifier"] or "",
-            "chat_display_name": row["chat_display_name"] or "",
-            "is_group": is_group,
-        })
+        messages.append(Message(
+            handle_id=handle_id or "",
+            text=text.strip(),
+            is_from_me=bool(is_from_me),
+            # Only known conversations show message times; the rest are
+            # just counted per day, so skip building their datetimes.
+            timestamp=convert_timestamp(msg_date) if decode_all or known else None,
+            day=day or today,
+            service=service or "iMessage",
+            chat_id=chat_identifier or "",
+            chat_display_name=chat_display_name or "",
+            is_group=(chat_style or 0) == 43,  # 43 = group chat
+        ))
 
     return messages
 
@@ -296,71 +407,81 @@ def match_contact(handle_id: str, known_contacts: dict[str, str]) -> str | None:
     return known_contacts.get(normalized)
 
 
+def resolve_contact_names(messages: list[Message], known_contacts: dict[str, str]) -> dict[str, str | None]:
+    """Match each distinct handle in messages against known contacts once.
+
+    Returns:
+        Dict mapping raw handle_id to contact name, or None if unmatched.
+    """
+    names: dict[str, str | None] = {}
+    for msg in messages:
+        handle = msg.handle_id
+        if handle not in names:
+            names[handle] = match_contact(handle, known_contacts)
+    return names
+
+
 # ---------------------------------------------------------------------------
 # Grouping and formatting
 # ---------------------------------------------------------------------------
 
 def group_messages_by_conversation(
-    messages: list[dict],
+    messages: list[Message],
     known_contacts: dict[str, str],
-) -> tuple[dict[str, list[dict]], int, int]:
+    names: dict[str, str | None] | None = None,
+) -> tuple[dict[str, list[Message]], int, int]:
     """Group messages by conversation and split into known/unknown.
 
     For direct messages, the key is the handle_id.
     For group chats, the key is the chat_id.
 
+    names is the resolve_contact_names result for messages; it is computed
+    here when not passed in.
+
     Returns:
         Tuple of:
         - Dict mapping conversation key to list of messages (known contacts only)
         - Count of unknown conversations
         - Count of unknown messages
     """
-    by_conversation: dict[str, list[dict]] = {}
+    if names is None:
+        names = resolve_contact_names(messages, known_contacts)
+    by_conversation: dict[str, list[Message]] = {}
+    # Keys shown to be known so far; bucketing and the known check share
+    # one pass, and a key stops being checked once it is in the set.
+    known_keys: set[str] = set()
 
     for msg in messages:
-        if msg["is_group"]:
-            key = msg["chat_id"] or msg["handle_id"] or "unknown-group"
+        if msg.is_group:
+            key = msg.chat_id or msg.handle_id or "unknown-group"
         else:
-            key = msg["handle_id"] or "unknown"
+            key = msg.handle_id or "unknown"
         by_conversation.setdefault(key, []).append(msg)
-
-    known_conversations: dict[str, list[dict]] = {}
-    unknown_conversation_count = 0
-    unknown_message_count = 0
-
-    for key, msgs in by_conversation.items():
-        # For group chats, check if any participants are known
-        is_known = False
-        for msg in msgs:
-            if msg["is_group"]:
-                # Group chat: consider known if it has a display name or
-                # any participant is a known contact
-                if msg["chat_display_name"]:
-                    is_known = True
-                    break
-                if not msg["is_from_me"] and match_contact(msg["handle_id"], known_contacts):
-                    is_known = True
-                    break
-            else:
-                # Direct message: check the handle
-                handle = msg["handle_id"] if not msg["is_from_me"] else key
-                if match_contact(handle, known_contacts):
-                    is_known = True
-                    break
-
-        if is_known:
-            known_conversations[key] = msgs
+        if key in known_keys:
+            continue
+        if msg.is_group:
+            # Group chat: consider known if it has a display name or
+            # any participant is a known contact
+            if msg.chat_display_name or (not msg.is_from_me and names[msg.handle_id]):
+                known_keys.add(key)
         else:
-            unknown_conversation_count += 1
-            unknown_message_count += len(msgs)
+            # Direct message: check the handle
+            handle = msg.handle_id if not msg.is_from_me else key
+            if names.get(handle):
+                known_keys.add(key)
+
+    known_conversations = {key: msgs for key, msgs in by_conversation.items() if key in known_keys}
+    unknown_conversation_count = len(by_conversation) - len(known_conversations)
+    unknown_message_count = len(messages) - sum(len(msgs) for msgs in known_conversations.values())
 
     return known_conversations, unknown_conversation_count, unknown_message_count
 
 
 def format_conversation(
     key: str,
-    messages: list[dict],
+    messages: list[Message],
     known_contacts: dict[str, str],
+    names: dict[str, str | None] | None = None,
 ) -> str:
     """Format a single conversation as markdown.
 
@@ -368,42 +489,47 @@ def format_conversation(
         key: Conversation identifier (handle_id or chat_id).
         messages: List of message dicts in this conversation.
         known_contacts: Known contact lookup dict.
+        names: resolve_contact_names result covering messages, if already
+            computed.
 
     Returns:
         Markdown string for this conversation.
     """
+    if names is None:
+        names = resolve_contact_names(messages, known_contacts)
     lines: list[str] = []
 
     # Determine conversation header
     first_msg = messages[0]
-    if first_msg["is_group"]:
-        display_name = first_msg["chat_display_name"] or key
+    # A direct chat's key is its handle_id (or "unknown", which never matches)
+    key_name = names.get(key)
+    if first_msg.is_group:
+        display_name = first_msg.chat_display_name or key
         lines.append(f"## {display_name} (group)")
     else:
-        contact_name = match_contact(key, known_contacts)
-        display_name = contact_name or key
+        display_name = key_name or key
         lines.append(f"## {display_name}")
 
     # Show handle ID for reference
-    if not first_msg["is_group"]:
+    if not first_msg.is_group:
         lines.append(f"*{key}*")
     lines.append("")
 
     # Format each message
     for msg in messages:
-        ts = msg["timestamp"]
+        ts = msg.timestamp
         time_str = ts.strftime("%H:%M") if ts else "??:??"
-        service = msg["service"]
+        service = msg.service
 
-        if msg["is_from_me"]:
+        if msg.is_from_me:
             sender = "You"
-        elif msg["is_group"]:
-            sender = match_contact(msg["handle_id"], known_contacts) or msg["handle_id"]
+        elif msg.is_group:
+            sender = names[msg.handle_id] or msg.handle_id
         else:
-            sender = match_contact(key, known_contacts) or key
+            sender = key_name or key
 
         service_tag = f" [{service}]" if service.lower() != "imessage" else ""
-        lines.append(f"- **{time_str}** {sender}{service_tag}: {msg['text']}")
+        lines.append(f"- **{time_str}** {sender}{service_tag}: {msg.text}")
 
     lines.append("")
     return "\n".join(lines)
@@ -411,7 +537,7 @@ def format_conversation(
 
 def format_day(
     date_str: str,
-    messages: list[dict],
+    messages: list[Message],
     known_contacts: dict[str, str],
 ) -> tuple[dict, str]:
     """Format a day's messages into frontmatter and body.
@@ -419,8 +545,10 @@ def format_day(
     Returns:
         Tuple of (frontmatter_dict, body_string).
     """
+    # Resolve each handle once for grouping and every conversation body
+    names = resolve_contact_names(messages, known_contacts)
     known_convos, unknown_convo_count, unknown_msg_count = (
-        group_messages_by_conversation(messages, known_contacts)
+        group_messages_by_conversation(messages, known_contacts, names)
     )
 
     total_conversations = len(known_convos) + unknown_convo_count
@@ -432,7 +560,7 @@ def format_day(
         "conversation_count": total_conversations,
         "message_count": total_messages,
         "known_contact_conversations": len(known_convos),
-        "services": sorted({m["service"] or "iMessage" for m in messages}),
+        "services": sorted({m.service or "iMessage" for m in messages}),
         "source": "imessage-local",
         "last_synced": datetime.now().isoformat(),
         "tags": ["data", "messages"],
@@ -450,13 +578,13 @@ def format_day(
         sorted_convos = sorted(
             known_convos.items(),
             key=lambda item: min(
-                (m["timestamp"] for m in item[1] if m["timestamp"]),
+                (m.timestamp for m in item[1] if m.timestamp),
                 default=datetime.min,
             ),
         )
 
         for key, msgs in sorted_convos:
-            body_lines.append(format_conversation(key, msgs, known_contacts))
+            body_lines.append(format_conversation(key, msgs, known_contacts, names))
             body_lines.append("---")
             body_lines.append("")
 
@@ -505,7 +633,8 @@ def main():
     conn = open_chat_db()
 
     try:
-        messages = fetch_messages(conn, args.days)
+        logger.debug(f"{count_recent_messages(conn, args.days)} messages in window")
+        messages = fetch_messages(conn, args.days, known_contacts)
     except Exception as e:
         logger.error(f"Failed to query iMessage database: {e}")
         sys.exit(1)
@@ -515,35 +644,33 @@ def main():
     logger.info(f"Fetched {len(messages)} messages")
 
     # Group messages by date
-    by_date: dict[str, list[dict]] = {}
+    by_date: dict[str, list[Message]] = {}
     for msg in messages:
-        if msg["timestamp"]:
-            msg_date = msg["timestamp"].strftime("%Y-%m-%d")
-        else:
-            msg_date = date.today().isoformat()
-        by_date.setdefault(msg_date, []).append(msg)
+        by_date.setdefault(msg.day, []).append(msg)
 
     files_written = 0
 
-    # Write a file for each day in the range
+    # Write a file for each day in the range. batch() creates data/messages
+    # once and writes every day file together when the block exits.
     today = date.today()
-    for i in range(args.days):
-        day = today - timedelta(days=i)
-        day_str = day.isoformat()
-
-        day_messages = by_date.get(day_str, [])
-        frontmatter, body = format_day(day_str, day_messages, known_contacts)
-        filename = f"{day_str}.md"
-
-        path = writer.write_data_file(
-            folder="messages",
-            filename=filename,
-            frontmatter=frontmatter,
-            body=body,
-            overwrite=True,
-        )
-        logger.info(f"Wrote {path} ({len(day_messages)} messages)")
-        files_written += 1
+    with writer.batch():
+        for i in range(args.days):
+            day = today - timedelta(days=i)
+            day_str = day.isoformat()
+
+            day_messages = by_date.get(day_str, [])
+            frontmatter, body = format_day(day_str, day_messages, known_contacts)
+            filename = f"{day_str}.md"
+
+            path = writer.write_data_file(
+                folder="messages",
+                filename=filename,
+                frontmatter=frontmatter,
+                body=body,
+                overwrite=True,
+            )
+            logger.info(f"Prepared {path} ({len(day_messages)} messages)")
+            files_written += 1
 
     state.touch_synced()
     logger.info(f"Done. {files_written} message file(s) written.")
@@ -2,37 +2,86 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable
 
 import yaml
 
+try:  # libyaml bindings parse frontmatter in C; fall back to pure Python
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+# Same pattern over raw bytes; only equivalent to EMAIL_RE on ASCII input.
+_EMAIL_RE_BYTES = re.compile(EMAIL_RE.pattern.encode("ascii"))
+_NON_DIGIT_RE = re.compile(r"[^\d]")
 
+# Parsed contact files, keyed per vault and invalidated per file by mtime/size.
+CACHE_DIR = Path.home() / ".cache" / "generous-ledger"
+CACHE_VERSION = 1
 
+# Leading bytes read per contact file; enough for any frontmatter block.
+FRONTMATTER_READ_SIZE = 4096
+
+# Changed files are parsed on a thread pool once there are more than this many.
+PARALLEL_PARSE_MIN_FILES = 4
+PARSE_WORKERS = 8
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize_phone(phone: str) -> str:
-    digits = re.sub(r"[^\d]", "", phone)
+    digits = _NON_DIGIT_RE.sub("", phone)
     if len(digits) == 11 and digits.startswith("1"):
         digits = digits[1:]
     return digits
 
 
-def _read_frontmatter(md_file: Path) -> tuple[dict, str]:
-    text = md_file.read_text(encoding="utf-8")
-    if not text.startswith("---"):
-        return {}, text
-    end = text.find("---", 3)
+def _read_frontmatter(md_file: Path, required_type: str | None = None) -> tuple[dict, bytes | None]:
+    """Split a file into parsed frontmatter and its undecoded body.
+
+    Reads FRONTMATTER_READ_SIZE bytes first and only reads further when
+    the closing --- is not in that chunk or the body is needed. Only the
+    frontmatter slice is decoded; the body stays bytes for _scan_emails.
+
+    If required_type is given and the frontmatter's type differs, the body
+    is never read and None is returned in its place.
+    """
+    with md_file.open("rb") as f:
+        data = f.read(FRONTMATTER_READ_SIZE)
+        end = data.find(b"---", 3) if data.startswith(b"---") else -1
+        if end == -1 and data.startswith(b"---"):
+            data += f.read()
+            end = data.find(b"---", 3)
+        frontmatter = None
+        if end != -1:
+            try:
+                frontmatter = yaml.load(data[3:end].decode("utf-8"), Loader=SafeLoader) or {}
+            except Exception:
+                pass
+        if not isinstance(frontmatter, dict):
+            frontmatter, end = {}, -1
+        if required_type is not None and str(frontmatter.get("type") or "") != required_type:
+            return frontmatter, None
+        rest = f.read()
     if end == -1:
-        return {}, text
-    try:
-        frontmatter = yaml.safe_load(text[3:end]) or {}
-    except Exception:
-        return {}, text
-    if not isinstance(frontmatter, dict):
-        return {}, text
-    return frontmatter, text[end + 3 :]
+        return {}, data + rest
+    return frontmatter, data[end + 3 :] + rest
+
+
+def _scan_emails(body: bytes) -> list[str]:
+    """Return the lowercased email addresses found in a file body."""
+    if body.isascii():
+        return [match.decode("ascii").lower() for match in _EMAIL_RE_BYTES.findall(body)]
+    # \w in a bytes pattern is ASCII-only, so non-ASCII text takes the str path
+    text = body.decode("utf-8", errors="replace")
+    return [match.lower() for match in EMAIL_RE.findall(text)]
 
 
 def _iter_values(value) -> Iterable[str]:
@@ -46,7 +95,7 @@ def _iter_values(value) -> Iterable[str]:
                 yield str(item)
 
 
-def _register_contact_points(mapping: dict[str, str], name: str, *, emails=(), phones=(), body: str = "") -> None:
+def _register_contact_points(mapping: dict[str, str], name: str, *, emails=(), phones=(), body_emails=()) -> None:
     for addr in emails:
         if "@" in addr:
             mapping[addr.strip().lower()] = name
@@ -56,42 +105,129 @@ def _register_contact_points(mapping: dict[str, str], name: str, *, emails=(), p
         if len(normalized) >= 7:
             mapping[normalized] = name
 
-    for match in EMAIL_RE.finditer(body):
-        mapping.setdefault(match.group(0).lower(), name)
+    for addr in body_emails:
+        mapping.setdefault(addr, name)
 
 
-def load_contact_identifier_map(vault_path: str) -> dict[str, str]:
-    vault = Path(vault_path).expanduser().resolve()
-    mapping: dict[str, str] = {}
+def _parse_contact_file(md_file: Path, email_key: str, phone_key: str, required_type: str | None) -> dict | None:
+    """Extract the contact points of one file, or None if it is not a contact."""
+    frontmatter, body = _read_frontmatter(md_file, required_type)
+    if body is None:
+        return None
+    return {
+        "name": str(frontmatter.get("name") or md_file.stem),
+        "emails": list(_iter_values(frontmatter.get(email_key, []))),
+        "phones": list(_iter_values(frontmatter.get(phone_key, []))),
+        "body_emails": _scan_emails(body),
+    }
 
-    people_dir = vault / "profile" / "people"
-    if people_dir.is_dir():
-        for md_file in sorted(people_dir.glob("*.md")):
-            frontmatter, body = _read_frontmatter(md_file)
-            name = str(frontmatter.get("name") or md_file.stem)
-            _register_contact_points(
-                mapping,
-                name,
-                emails=list(_iter_values(frontmatter.get("email", []))),
-                phones=list(_iter_values(frontmatter.get("phone", []))),
-                body=body,
-            )
-
-    contacts_dir = vault / "data" / "contacts"
-    if contacts_dir.is_dir():
-        for md_file in sorted(contacts_dir.glob("*.md")):
-            frontmatter, body = _read_frontmatter(md_file)
-            if str(frontmatter.get("type") or "") != "contact-entry":
-                continue
-            name = str(frontmatter.get("name") or md_file.stem)
-            _register_contact_points(
-                mapping,
-                name,
-                emails=list(_iter_values(frontmatter.get("emails", []))),
-                phones=list(_iter_values(frontmatter.get("phones", []))),
-                body=body,
-            )
 
+def _cache_path(vault: Path) -> Path:
+    digest = hashlib.blake2b(str(vault).encode("utf-8"), digest_size=8).hexdigest()
+    return CACHE_DIR / f"contacts-{digest}.json"
+
+
+def _load_cache(path: Path) -> dict:
+    try:
+        with path.open("rb") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def _save_cache(path: Path, files: dict) -> None:
+    """Replace the cache file; readable only by the owner (it holds emails and phones)."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": files}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The cache is an optimization; a read-only home just disables it.
+
+
+def _markdown_files(directory: Path) -> list[tuple[Path, os.stat_result]]:
+    """List a directory's *.md files with their stat, sorted by name.
+
+    One scandir pass instead of glob("*.md") plus a stat per match; the
+    entries also let directories named *.md be skipped. Dotfiles are
+    included, as glob included them.
+    """
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".md") and entry.is_file():
+                files.append((entry.name, entry.stat()))
+    files.sort()
+    return [(directory / name, stat) for name, stat in files]
+
+
+# (subdirectory, email key, phone key, required frontmatter type)
+_CONTACT_SOURCES = (
+    (("profile", "people"), "email", "phone", None),
+    (("data", "contacts"), "emails", "phones", "contact-entry"),
+)
+
+
+def load_contact_identifier_map(vault_path: str, use_cache: bool = True) -> dict[str, str]:
+    """Map normalized emails and phone numbers to contact names.
+
+    Reads profile/people/*.md and synced data/contacts/*.md. Parsed files
+    are cached on disk and only re-read when their mtime or size changes;
+    when more than a few files changed they are parsed on a thread pool.
+    """
+    vault = Path(vault_path).expanduser().resolve()
+    cache_path = _cache_path(vault)
+    cached = _load_cache(cache_path) if use_cache else {}
+    files: dict[str, dict] = {}
+    stale: list[tuple[str, Path, str, str, str | None]] = []
+
+    for parts, email_key, phone_key, required_type in _CONTACT_SOURCES:
+        directory = vault.joinpath(*parts)
+        if not directory.is_dir():
+            continue
+        for md_file, stat in _markdown_files(directory):
+            fingerprint = [stat.st_mtime_ns, stat.st_size]
+            key = str(md_file)
+            entry = cached.get(key)
+            if entry is None or entry.get("fp") != fingerprint:
+                entry = {"fp": fingerprint, "record": None}
+                stale.append((key, md_file, email_key, phone_key, required_type))
+            files[key] = entry
+
+    def parse(job):
+        _, md_file, email_key, phone_key, required_type = job
+        return _parse_contact_file(md_file, email_key, phone_key, required_type)
+
+    if len(stale) > PARALLEL_PARSE_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+            records = list(pool.map(parse, stale))
+    else:
+        records = [parse(job) for job in stale]
+    for job, record in zip(stale, records):
+        files[job[0]]["record"] = record
+
+    # files keeps directory and glob order, so later sources still win ties
+    mapping: dict[str, str] = {}
+    for entry in files.values():
+        record = entry["record"]
+        if record is None:
+            continue
+        _register_contact_points(
+            mapping,
+            record["name"],
+            emails=record["emails"],
+            phones=record["phones"],
+            body_emails=record["body_emails"],
+        )
+
+    if use_cache and files != cached:
+        _save_cache(cache_path, files)
     return mapping
 
 
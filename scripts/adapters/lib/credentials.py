@@ -11,11 +11,18 @@ USAGE:
     config = get_config()            # reads ~/.config/generous-ledger/config.yaml
 """
 
+import copy
+import functools
 import json
 import os
 import yaml
 from pathlib import Path
 
+try:  # libyaml's parser when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 CONFIG_DIR = Path.home() / ".config" / "generous-ledger"
 CREDENTIALS_DIR = CONFIG_DIR / "credentials"
@@ -29,9 +36,24 @@ def ensure_config_dirs() -> None:
     os.chmod(CREDENTIALS_DIR, 0o700)
 
 
+@functools.lru_cache(maxsize=None)
+def _read_credential(name: str) -> dict:
+    path = CREDENTIALS_DIR / f"{name}.json"
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Credential not found: {path}\n"
+            f"Create it with the appropriate API key/token."
+        )
+    with path.open("rb") as f:
+        return json.load(f)
+
+
 def load_credential(name: str) -> dict:
     """Load a credential file by name (without extension).
 
+    The file is read once per process; each call returns a fresh copy, so
+    callers may modify it freely.
+
     Args:
         name: Credential name (e.g., "ynab", "google-calendar")
 
@@ -41,13 +63,7 @@ def load_credential(name: str) -> dict:
     Raises:
         FileNotFoundError: If credential file doesn't exist.
     """
-    path = CREDENTIALS_DIR / f"{name}.json"
-    if not path.exists():
-        raise FileNotFoundError(
-            f"Credential not found: {path}\n"
-            f"Create it with the appropriate API key/token."
-        )
-    return json.loads(path.read_text(encoding="utf-8"))
+    return copy.deepcopy(_read_credential(name))
 
 
 def save_credential(name: str, data: dict) -> Path:
@@ -64,15 +80,24 @@ def save_credential(name: str, data: dict) -> Path:
     path = CREDENTIALS_DIR / f"{name}.json"
     path.write_text(json.dumps(data, indent=2), encoding="utf-8")
     os.chmod(path, 0o600)
+    _read_credential.cache_clear()
     return path
 
 
 def get_config() -> dict:
     """Load the main config file.
 
+    The file is read once per process; each call returns a fresh copy, so
+    callers may modify it freely.
+
     Returns:
         Dict of config data, or defaults if file doesn't exist.
     """
+    return copy.deepcopy(_read_config())
+
+
+@functools.lru_cache(maxsize=1)
+def _read_config() -> dict:
     config_path = CONFIG_DIR / "config.yaml"
     if not config_path.exists():
         return {
@@ -88,4 +113,4 @@ def get_config() -> dict:
                 "voice_notes": {"enabled": False, "import_path": "~/Documents/Achaean/inbox/voice"},
             },
         }
-    return yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    return yaml.load(config_path.read_bytes(), Loader=SafeLoader)
@@ -27,15 +27,19 @@ def setup_logging(adapter_name: str) -> logging.Logger:
     Returns:
         Configured logger instance.
     """
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-    log_file = LOG_DIR / f"{adapter_name}-{date.today().isoformat()}.log"
-
     logger = logging.getLogger(f"generous-ledger.{adapter_name}")
+    if logger.handlers:
+        # Already configured in this process; adding handlers again would
+        # duplicate every record.
+        return logger
     logger.setLevel(logging.DEBUG)
 
-    # File handler
-    fh = logging.FileHandler(log_file, encoding="utf-8")
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_file = LOG_DIR / f"{adapter_name}-{date.today().isoformat()}.log"
+
+    # File handler; delay=True opens the file on the first record, so a run
+    # that logs nothing creates no file
+    fh = logging.FileHandler(log_file, encoding="utf-8", delay=True)
     fh.setLevel(logging.DEBUG)
     fh.setFormatter(
         logging.Formatter("%(asctime)s %(levelname)s %(message)s")
@@ -33,7 +33,8 @@ class SyncState:
 
     def _load(self) -> dict:
         if self.path.exists():
-            return json.loads(self.path.read_text(encoding="utf-8"))
+            with self.path.open("rb") as f:
+                return json.load(f)
         return {}
 
     def get(self, key: str, default=None):
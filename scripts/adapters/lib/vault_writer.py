@@ -15,13 +15,66 @@ USAGE:
         frontmatter={"type": "weather-daily", "date": "2026-02-21"},
         body="Partly cloudy, high of 45°F.",
     )
+
+    # Many files at once: writes are collected and flushed together on exit.
+    with writer.batch():
+        for day in days:
+            writer.write_data_file("calendar", f"{day}.md", fm, body)
 """
 
+from __future__ import annotations
+
+import hashlib
+import json
 import os
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterable
 from datetime import datetime
 
+try:  # libyaml's emitter when PyYAML was built with it
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
+
+# Batches with at least this many files are flushed on a thread pool.
+PARALLEL_FLUSH_MIN_FILES = 16
+FLUSH_WORKERS = 8
+
+# Frontmatter keys that change on every sync and so are left out of
+# content_hash, unless the caller passes its own set.
+VOLATILE_KEYS = frozenset({"last_synced"})
+
+
+def content_hash(frontmatter: dict, body: str, volatile_keys: Iterable[str] = VOLATILE_KEYS) -> str:
+    """Hash a file's frontmatter (minus volatile keys) and body."""
+    volatile_keys = {*volatile_keys, "content_hash"}
+    stable = {k: v for k, v in frontmatter.items() if k not in volatile_keys}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(stable, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(body.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _stored_content_hash(file_path: Path) -> str | None:
+    """Read content_hash from an existing file's frontmatter, if present."""
+    try:
+        with file_path.open(encoding="utf-8") as f:
+            if f.readline().rstrip("\n") != "---":
+                return None
+            for line in f:
+                if line.startswith("---"):
+                    return None
+                if line.startswith("content_hash:"):
+                    return line.split(":", 1)[1].strip().strip("'\"")
+    except OSError:
+        return None
+    return None
+
 
 class VaultWriter:
     """Write markdown files with YAML frontmatter to an Obsidian vault."""
@@ -30,6 +83,73 @@ class VaultWriter:
         self.vault_path = Path(vault_path).expanduser().resolve()
         if not self.vault_path.is_dir():
             raise FileNotFoundError(f"Vault not found: {self.vault_path}")
+        # Path -> content for writes deferred by batch(); None when not batching.
+        self._pending: dict[Path, str] | None = None
+
+    @contextmanager
+    def batch(self):
+        """Defer writes made inside the block and flush them together on exit.
+
+        Each target directory is created once and every file is written in a
+        single pass, instead of interleaving serialization with file I/O.
+        Nothing is written if the block raises.
+        """
+        if self._pending is not None:
+            # Already batching; the outer block owns the flush.
+            yield self
+            return
+        self._pending = {}
+        try:
+            yield self
+            pending = self._pending
+        finally:
+            self._pending = None
+        self._flush(pending)
+
+    def _flush(self, pending: dict[Path, str]) -> None:
+        for directory in {path.parent for path in pending}:
+            directory.mkdir(parents=True, exist_ok=True)
+        if len(pending) < PARALLEL_FLUSH_MIN_FILES:
+            for path, content in pending.items():
+                self._write_atomic(path, content)
+            return
+        # Large flushes (backfills) overlap the open/write/rename syscalls;
+        # list() re-raises the first write error, if any
+        with ThreadPoolExecutor(max_workers=FLUSH_WORKERS) as pool:
+            list(pool.map(self._write_atomic, pending.keys(), pending.values()))
+
+    @staticmethod
+    def _render(frontmatter: dict, body: str) -> str:
+        yaml_str = yaml.dump(
+            frontmatter,
+            Dumper=SafeDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        ).rstrip()
+        return f"---\n{yaml_str}\n---\n\n{body}\n"
+
+    def _write(self, file_path: Path, content: str) -> None:
+        if self._pending is not None:
+            self._pending[file_path] = content
+            return
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(file_path, content)
+
+    @staticmethod
+    def _write_atomic(file_path: Path, content: str) -> None:
+        # Atomic write: write to temp file, then rename over the target.
+        # Raw os calls skip the text-layer buffering; no fsync, since every
+        # file is regenerated on the next sync if a crash loses it.
+        tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+        data = memoryview(content.encode("utf-8"))
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, file_path)
 
     def write_data_file(
         self,
@@ -38,6 +158,8 @@ class VaultWriter:
         frontmatter: dict,
         body: str,
         overwrite: bool = True,
+        skip_unchanged: bool = False,
+        volatile_keys: Iterable[str] = VOLATILE_KEYS,
     ) -> Path:
         """Write a markdown file with YAML frontmatter to data/<folder>/<filename>.
 
@@ -47,33 +169,27 @@ class VaultWriter:
             frontmatter: Dict of YAML frontmatter properties
             body: Markdown body content
             overwrite: If True, replace existing file. If False, skip if exists.
+            skip_unchanged: If True, record a content_hash in the frontmatter
+                and leave the existing file untouched when its stored hash
+                matches. Volatile keys such as last_synced are not hashed.
+            volatile_keys: Frontmatter keys left out of the content_hash
+                because they change on every sync. Defaults to VOLATILE_KEYS.
 
         Returns:
             Path to the written file.
         """
-        data_dir = self.vault_path / "data" / folder
-        data_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self.vault_path / "data" / folder / filename
 
-        file_path = data_dir / filename
-
-        if not overwrite and file_path.exists():
+        if not overwrite and (file_path.exists() or file_path in (self._pending or {})):
             return file_path
 
-        # Serialize frontmatter to YAML
-        yaml_str = yaml.dump(
-            frontmatter,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-        ).rstrip()
-
-        content = f"---\n{yaml_str}\n---\n\n{body}\n"
-
-        # Atomic write: write to temp file, then rename
-        tmp_path = file_path.with_suffix(".tmp")
-        tmp_path.write_text(content, encoding="utf-8")
-        tmp_path.rename(file_path)
+        if skip_unchanged:
+            digest = content_hash(frontmatter, body, volatile_keys)
+            if _stored_content_hash(file_path) == digest:
+                return file_path
+            frontmatter = {**frontmatter, "content_hash": digest}
 
+        self._write(file_path, self._render(frontmatter, body))
         return file_path
 
     def write_file(
@@ -85,22 +201,11 @@ class VaultWriter:
     ) -> Path:
         """Write a markdown file relative to the vault root."""
         file_path = self.vault_path / relative_path
-        file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if not overwrite and file_path.exists():
+        if not overwrite and (file_path.exists() or file_path in (self._pending or {})):
             return file_path
 
-        yaml_str = yaml.dump(
-            frontmatter,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-        ).rstrip()
-
-        content = f"---\n{yaml_str}\n---\n\n{body}\n"
-        tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
-        tmp_path.write_text(content, encoding="utf-8")
-        tmp_path.rename(file_path)
+        self._write(file_path, self._render(frontmatter, body))
         return file_path
 
     def clear_data_folder(self, folder: str, pattern: str = "*.md") -> int:
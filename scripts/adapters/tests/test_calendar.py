@@ -0,0 +1,64 @@
+"""Tests for calendar.py — writing the calendar day files."""
+
+import importlib.util
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+# calendar.py shares its name with the stdlib module, so load it by path.
+_spec = importlib.util.spec_from_file_location(
+    "calendar_adapter", Path(__file__).parent.parent / "calendar.py"
+)
+calendar_adapter = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(calendar_adapter)
+
+
+class TestCalendarMain(unittest.TestCase):
+    def setUp(self):
+        self.vault = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.vault, ignore_errors=True)
+        for target, value in [
+            ("get_calendar_service", MagicMock()),
+            ("fetch_events", MagicMock(return_value=iter([]))),
+            ("SyncState", MagicMock()),
+            ("setup_logging", MagicMock()),
+        ]:
+            patcher = patch.object(calendar_adapter, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, days=3):
+        argv = ["calendar.py", "--vault", self.vault, "--days", str(days)]
+        with patch.object(sys, "argv", argv):
+            calendar_adapter.main()
+
+    def test_writes_a_file_per_day(self):
+        self._run(days=3)
+        today = date.today()
+        expected = sorted(f"{(today + timedelta(days=i)).isoformat()}.md" for i in range(3))
+        written = sorted(p.name for p in (Path(self.vault) / "data" / "calendar").iterdir())
+        self.assertEqual(written, expected)
+
+    def test_unchanged_days_are_not_rewritten(self):
+        self._run(days=1)
+        (path,) = (Path(self.vault) / "data" / "calendar").iterdir()
+        first = path.read_text()
+        self._run(days=1)
+        # last_synced changed, but the file was left as it was
+        self.assertEqual(path.read_text(), first)
+
+    def test_write_failure_exits(self):
+        with patch.object(calendar_adapter.VaultWriter, "_write_atomic", side_effect=OSError("disk full")):
+            with self.assertRaises(SystemExit) as raised:
+                self._run(days=1)
+        self.assertEqual(raised.exception.code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Tests for credentials.py — cached config and credential loading."""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent))
+from lib import credentials
+from lib.credentials import get_config, load_credential, save_credential
+
+
+class TestCredentials(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        for name, value in [
+            ("CONFIG_DIR", self.tmp),
+            ("CREDENTIALS_DIR", self.tmp / "credentials"),
+        ]:
+            patcher = patch.object(credentials, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        credentials._read_config.cache_clear()
+        credentials._read_credential.cache_clear()
+        self.addCleanup(credentials._read_config.cache_clear)
+        self.addCleanup(credentials._read_credential.cache_clear)
+
+    def test_config_mutation_does_not_leak(self):
+        (self.tmp / "config.yaml").write_text("vault_path: ~/Vault\nlocation:\n  latitude: 1.5\n")
+        config = get_config()
+        config.setdefault("extra", True)
+        config["location"]["latitude"] = 99
+        self.assertEqual(get_config(), {"vault_path": "~/Vault", "location": {"latitude": 1.5}})
+
+    def test_config_read_once(self):
+        path = self.tmp / "config.yaml"
+        path.write_text("vault_path: ~/Vault\n")
+        get_config()
+        path.write_text("vault_path: ~/Other\n")
+        self.assertEqual(get_config()["vault_path"], "~/Vault")
+
+    def test_credential_mutation_does_not_leak(self):
+        save_credential("ynab", {"token": "abc"})
+        creds = load_credential("ynab")
+        creds["token"] = "changed"
+        self.assertEqual(load_credential("ynab"), {"token": "abc"})
+
+    def test_save_credential_refreshes_cache(self):
+        save_credential("ynab", {"token": "abc"})
+        load_credential("ynab")
+        save_credential("ynab", {"token": "new"})
+        self.assertEqual(load_credential("ynab"), {"token": "new"})
+        self.assertEqual(json.loads((self.tmp / "credentials" / "ynab.json").read_text()), {"token": "new"})
+
+
+if __name__ == "__main__":
+    unittest.main()
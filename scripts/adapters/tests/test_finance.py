@@ -0,0 +1,164 @@
+"""Tests for finance.py — YNAB requests, budget ID caching, and summary formatting."""
+
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError, URLError
+
+sys.path.append(str(Path(__file__).parent.parent))
+import finance
+from finance import format_weekly_summary
+
+
+class TestFormatWeeklySummary(unittest.TestCase):
+    """Test weekly budget summary formatting."""
+
+    def test_weekly_summary_format(self):
+        categories = [
+            {"group": "Bills", "name": "Rent", "budgeted": 1500, "activity": 1500, "balance": 0},
+            {"group": "Food", "name": "Groceries", "budgeted": 400, "activity": 450, "balance": -50},
+            {"group": "Food", "name": "Dining Out", "budgeted": 100, "activity": 50, "balance": 50},
+        ]
+
+        week_start = date(2026, 2, 16)
+        fm, body = format_weekly_summary(categories, week_start)
+
+        self.assertEqual(fm["type"], "finance-weekly")
+        self.assertEqual(fm["total_budgeted"], 2000)
+        self.assertEqual(fm["total_spent"], 2000)
+        self.assertIn("Groceries", fm["over_budget_categories"])
+        self.assertIn("OVER", body)
+        self.assertIn("Groceries", body)
+
+
+class _FakeState:
+    def __init__(self, **data):
+        self._data = data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def set(self, key, value):
+        self._data[key] = value
+
+
+class TestBudgetId(unittest.TestCase):
+    """Test the cached budget ID."""
+
+    def _fresh_expiry(self):
+        return (datetime.now() + timedelta(days=1)).isoformat()
+
+    def test_cached_id_reused_until_expiry(self):
+        state = _FakeState(budget_id="cached", budget_id_expires_at=self._fresh_expiry())
+        with patch.object(finance, "ynab_request") as request:
+            self.assertEqual(finance.get_default_budget_id("t", state), "cached")
+        request.assert_not_called()
+
+    def test_malformed_expiry_refetches(self):
+        state = _FakeState(budget_id="cached", budget_id_expires_at="not a date")
+        response = {"data": {"budgets": [{"id": "fresh"}]}}
+        with patch.object(finance, "ynab_request", return_value=response):
+            self.assertEqual(finance.get_default_budget_id("t", state), "fresh")
+        self.assertEqual(state.get("budget_id"), "fresh")
+
+    def test_404_drops_cached_id_and_retries_once(self):
+        state = _FakeState(budget_id="deleted", budget_id_expires_at=self._fresh_expiry())
+
+        def ynab_request(endpoint, token, parse=None):
+            if endpoint == "/budgets":
+                return {"data": {"budgets": [{"id": "current"}]}}
+            if endpoint.startswith("/budgets/deleted/"):
+                raise HTTPError(endpoint, 404, "Not Found", {}, None)
+            return [{"group": "Bills", "name": "Rent"}]
+
+        with patch.object(finance, "ynab_request", side_effect=ynab_request):
+            categories = finance.fetch_categories("t", state)
+        self.assertEqual(categories, [{"group": "Bills", "name": "Rent"}])
+        self.assertEqual(state.get("budget_id"), "current")
+
+    def test_persistent_404_raises(self):
+        state = _FakeState(budget_id="gone", budget_id_expires_at=self._fresh_expiry())
+
+        def ynab_request(endpoint, token, parse=None):
+            if endpoint == "/budgets":
+                return {"data": {"budgets": [{"id": "gone"}]}}
+            raise HTTPError(endpoint, 404, "Not Found", {}, None)
+
+        with patch.object(finance, "ynab_request", side_effect=ynab_request) as request:
+            with self.assertRaises(HTTPError):
+                finance.fetch_categories("t", state)
+        # The cached ID skipped /budgets; only the single retry looked it up
+        self.assertEqual(sum(c.args[0] == "/budgets" for c in request.call_args_list), 1)
+
+
+class TestYnabRequest(unittest.TestCase):
+    """Test retries and error handling in YNAB requests."""
+
+    def _urlopen(self, *outcomes):
+        """Mock urlopen that raises each exception or returns each body in turn."""
+        effects = []
+        for outcome in outcomes:
+            if not isinstance(outcome, Exception):
+                resp = MagicMock()
+                resp.__enter__.return_value.read.return_value = outcome
+                outcome = resp
+            effects.append(outcome)
+        return MagicMock(side_effect=effects)
+
+    def _http_error(self, code):
+        return HTTPError("url", code, "error", {}, None)
+
+    def test_retries_server_errors_then_succeeds(self):
+        urlopen = self._urlopen(self._http_error(503), self._http_error(429), b'{"data": 1}')
+        with patch.object(finance, "urlopen", urlopen), patch.object(finance.time, "sleep"):
+            self.assertEqual(finance.ynab_request("/budgets", "t"), {"data": 1})
+        self.assertEqual(urlopen.call_count, 3)
+
+    def test_gives_up_after_retries(self):
+        urlopen = self._urlopen(*[self._http_error(500)] * 3)
+        with patch.object(finance, "urlopen", urlopen), patch.object(finance.time, "sleep"):
+            with self.assertRaises(HTTPError) as raised:
+                finance.ynab_request("/budgets", "t")
+        self.assertEqual(raised.exception.code, 500)
+        self.assertEqual(urlopen.call_count, finance.YNAB_RETRIES)
+
+    def test_client_errors_are_not_retried(self):
+        urlopen = self._urlopen(self._http_error(404))
+        with patch.object(finance, "urlopen", urlopen):
+            with self.assertRaises(HTTPError):
+                finance.ynab_request("/budgets", "t")
+        self.assertEqual(urlopen.call_count, 1)
+
+    def test_dropped_connection_retried_as_url_error(self):
+        urlopen = self._urlopen(*[ConnectionResetError()] * 3)
+        with patch.object(finance, "urlopen", urlopen), patch.object(finance.time, "sleep"):
+            with self.assertRaises(URLError):
+                finance.ynab_request("/budgets", "t")
+
+    def test_parse_error_is_not_retried(self):
+        urlopen = self._urlopen(b"not json")
+        with patch.object(finance, "urlopen", urlopen):
+            with self.assertRaises(ValueError):
+                finance.ynab_request("/budgets", "t")
+        self.assertEqual(urlopen.call_count, 1)
+
+    def test_streaming_json_error_becomes_value_error(self):
+        class JSONError(Exception):
+            pass
+
+        def items(resp, prefix, use_float=False):
+            yield {"name": "Bills", "categories": []}
+            raise JSONError("Incomplete JSON content")
+
+        fake_ijson = MagicMock(JSONError=JSONError, items=items)
+        with patch.dict(sys.modules, {"ijson": fake_ijson}):
+            groups = finance._iter_category_groups(MagicMock())
+            self.assertEqual(next(groups)["name"], "Bills")
+            with self.assertRaises(ValueError):
+                next(groups)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,14 +9,22 @@ from unittest.mock import MagicMock, patch
 
 sys.path.append(str(Path(__file__).parent.parent))
 from gmail import (
+    GET_BATCH_SIZE,
+    _chunk_emails,
     extract_body_text,
     extract_sender_email,
     extract_sender_name,
     format_day,
     get_header,
+    get_headers,
     group_by_sender,
+    load_body_cache,
     load_known_contacts,
+    parse_date_header,
     parse_message,
+    parse_sender,
+    save_body_cache,
+    fetch_full_messages,
     fetch_messages,
     strip_html_tags,
 )
@@ -114,6 +122,13 @@ class TestParseMessage(unittest.TestCase):
         self.assertIsNone(parsed["date"])
         self.assertEqual(parsed["date_str"], "")
 
+    def test_repeated_date_header_parsed_once(self):
+        header = "Wed, 19 Feb 2026 09:30:00 -0500"
+        first = parse_message(_make_gmail_message(date_header=header), {})
+        second = parse_message(_make_gmail_message(date_header=header), {})
+        self.assertIs(first["date"], second["date"])
+        self.assertIsNone(parse_date_header("Wed, 19 Feb 99999 09:30:00"))
+
     def test_missing_subject_defaults(self):
         msg = _make_gmail_message(subject="")
         # Manually clear the subject header
@@ -155,6 +170,47 @@ class TestParseMessage(unittest.TestCase):
         parsed = parse_message(msg, {})
         self.assertEqual(parsed["body"], "Plain version")
 
+    def test_nested_multipart_finds_plain_text(self):
+        def part(mime, text):
+            return {"mimeType": mime, "body": {"data": base64.urlsafe_b64encode(text.encode()).decode()}}
+
+        payload = {
+            "mimeType": "multipart/mixed",
+            "parts": [
+                {
+                    "mimeType": "multipart/related",
+                    "parts": [
+                        {
+                            "mimeType": "multipart/alternative",
+                            "parts": [part("text/html", "<p>Deep HTML</p>"), part("text/plain", "Deep plain")],
+                        },
+                    ],
+                },
+                part("text/plain", "Later plain"),
+            ],
+        }
+        self.assertEqual(extract_body_text(payload), "Deep plain")
+
+    def test_malformed_base64_body_is_empty(self):
+        payload = {"mimeType": "text/plain", "body": {"data": "not*base64!"}}
+        self.assertEqual(extract_body_text(payload), "")
+
+    def test_unpadded_base64_body(self):
+        data = base64.urlsafe_b64encode("Héllo?>".encode()).decode().rstrip("=")
+        payload = {"mimeType": "text/plain", "body": {"data": data}}
+        self.assertEqual(extract_body_text(payload), "Héllo?>")
+
+    def test_nested_html_fallback(self):
+        html = base64.urlsafe_b64encode(b"<p>Only HTML</p>").decode()
+        payload = {
+            "mimeType": "multipart/mixed",
+            "parts": [
+                {"mimeType": "multipart/alternative", "parts": [{"mimeType": "text/html", "body": {"data": html}}]},
+                {"mimeType": "application/pdf", "body": {}},
+            ],
+        }
+        self.assertEqual(extract_body_text(payload), "Only HTML")
+
     def test_unknown_contact(self):
         msg = _make_gmail_message(from_header="stranger@unknown.com")
         parsed = parse_message(msg, {"alice@example.com": "Alice"})
@@ -176,6 +232,14 @@ class TestHeaderExtraction(unittest.TestCase):
         self.assertEqual(get_header(msg, "FROM"), "Alice Smith <alice@example.com>")
         self.assertEqual(get_header(msg, "From"), "Alice Smith <alice@example.com>")
 
+    def test_get_headers_lowercases_names_first_wins(self):
+        msg = {"payload": {"headers": [
+            {"name": "Received", "value": "first"},
+            {"name": "RECEIVED", "value": "second"},
+            {"name": "Subject", "value": "Hi"},
+        ]}}
+        self.assertEqual(get_headers(msg), {"received": "first", "subject": "Hi"})
+
     def test_get_header_missing(self):
         msg = _make_gmail_message()
         self.assertEqual(get_header(msg, "X-Custom-Header"), "")
@@ -192,6 +256,10 @@ class TestHeaderExtraction(unittest.TestCase):
     def test_extract_sender_name_with_name(self):
         self.assertEqual(extract_sender_name("Alice Smith <alice@example.com>"), "Alice Smith")
 
+    def test_parse_sender(self):
+        self.assertEqual(parse_sender("Alice <ALICE@Example.COM>"), ("Alice", "alice@example.com"))
+        self.assertEqual(parse_sender("Bob@Example.com"), ("Bob@Example.com", "bob@example.com"))
+
     def test_extract_sender_name_bare_email(self):
         self.assertEqual(extract_sender_name("alice@example.com"), "alice@example.com")
 
@@ -222,10 +290,47 @@ class TestStripHtmlTags(unittest.TestCase):
         self.assertIn("<", result)
         self.assertIn(">", result)
 
+    def test_numeric_and_named_entities(self):
+        result = strip_html_tags("caf&eacute; &#8212; &#x2019;")
+        self.assertEqual(result, "café — \u2019")
+
+    def test_script_contents_with_markup_removed(self):
+        html = '<script>var s = "<p>not text</p>";</script><p>Visible</p>'
+        result = strip_html_tags(html)
+        self.assertNotIn("not text", result)
+        self.assertIn("Visible", result)
+
+    def test_comments_removed(self):
+        result = strip_html_tags("<p>Keep</p><!-- hidden <b>note</b> -->")
+        self.assertEqual(result, "Keep")
+
+    def test_unclosed_style_block_is_linear(self):
+        # ~100KB of style with no closing tag; must not backtrack
+        html = "<p>Before</p><style>" + "a{color:red}" * 9000
+        self.assertEqual(strip_html_tags(html), "Before")
+
+    def test_unclosed_comment_and_tag(self):
+        result = strip_html_tags("<p>Before</p><!--" + "x" * 100_000)
+        self.assertTrue(result.startswith("Before"))
+        result = strip_html_tags("<p>Before</p><div" + ' a="b"' * 20_000)
+        self.assertTrue(result.startswith("Before"))
+
 
 class TestContactMatching(unittest.TestCase):
     """Test loading contacts from profile/people/*.md files."""
 
+    def setUp(self):
+        import tempfile
+        # Keep the parsed-contacts cache out of the real home directory
+        self.cache_dir = tempfile.mkdtemp()
+        patcher = patch("lib.contact_index.CACHE_DIR", Path(self.cache_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
     def test_load_contacts_from_frontmatter(self):
         import tempfile, shutil
 
@@ -265,6 +370,59 @@ class TestContactMatching(unittest.TestCase):
         finally:
             shutil.rmtree(tmp, ignore_errors=True)
 
+    def test_load_contacts_scans_non_ascii_body(self):
+        import tempfile, shutil
+
+        tmp = tempfile.mkdtemp()
+        try:
+            people_dir = Path(tmp) / "profile" / "people"
+            people_dir.mkdir(parents=True)
+
+            (people_dir / "jose.md").write_text(
+                "---\nname: José Núñez\n---\nCorreo: “jose.nunez@example.com” — josé@example.es\n",
+                encoding="utf-8",
+            )
+
+            contacts = load_known_contacts(tmp)
+            self.assertEqual(contacts["jose.nunez@example.com"], "José Núñez")
+            self.assertEqual(contacts["josé@example.es"], "José Núñez")
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def test_load_many_contacts_in_parallel(self):
+        import tempfile, shutil
+
+        tmp = tempfile.mkdtemp()
+        try:
+            people_dir = Path(tmp) / "profile" / "people"
+            people_dir.mkdir(parents=True)
+            for i in range(12):
+                (people_dir / f"p{i:02d}.md").write_text(
+                    f"---\nname: Person {i}\nemail: p{i}@example.com\n---\n"
+                )
+
+            contacts = load_known_contacts(tmp)
+            self.assertEqual(contacts, {f"p{i}@example.com": f"Person {i}" for i in range(12)})
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def test_load_contacts_frontmatter_longer_than_first_read(self):
+        import tempfile, shutil
+
+        tmp = tempfile.mkdtemp()
+        try:
+            people_dir = Path(tmp) / "profile" / "people"
+            people_dir.mkdir(parents=True)
+            notes = "x" * 5000
+            (people_dir / "dana.md").write_text(
+                f"---\nname: Dana\nnotes: {notes}\nemail: dana@example.com\n---\nAlt: dana@alt.com\n"
+            )
+
+            contacts = load_known_contacts(tmp)
+            self.assertEqual(contacts, {"dana@example.com": "Dana", "dana@alt.com": "Dana"})
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
     def test_load_contacts_empty_dir(self):
         import tempfile, shutil
 
@@ -290,6 +448,28 @@ class TestContactMatching(unittest.TestCase):
         finally:
             shutil.rmtree(tmp, ignore_errors=True)
 
+    def test_load_contacts_reuses_cache_for_unchanged_files(self):
+        import tempfile, shutil
+
+        tmp = tempfile.mkdtemp()
+        try:
+            people_dir = Path(tmp) / "profile" / "people"
+            people_dir.mkdir(parents=True)
+            (people_dir / "alice.md").write_text(
+                "---\nname: Alice Smith\nemail: alice@example.com\n---\n"
+            )
+            self.assertEqual(load_known_contacts(tmp), {"alice@example.com": "Alice Smith"})
+
+            with patch("lib.contact_index._read_frontmatter", side_effect=AssertionError("re-read")):
+                self.assertEqual(load_known_contacts(tmp), {"alice@example.com": "Alice Smith"})
+
+            (people_dir / "alice.md").write_text(
+                "---\nname: Alice Smith\nemail: alice@new-domain.com\n---\n"
+            )
+            self.assertEqual(load_known_contacts(tmp), {"alice@new-domain.com": "Alice Smith"})
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
     def test_email_lowercased(self):
         import tempfile, shutil
 
@@ -402,6 +582,58 @@ class TestFormatDay(unittest.TestCase):
         stranger_pos = body.find("Stranger")
         self.assertLess(alice_pos, stranger_pos)
 
+    def test_unknown_senders_ordered_by_latest_message(self):
+        msgs = [
+            self._make_parsed_message(
+                id="b1", from_name="Bob", from_email="bob@example.com",
+                is_known_contact=False, date=datetime(2026, 2, 17, 9, 0),
+            ),
+            self._make_parsed_message(
+                id="c1", from_name="Carol", from_email="carol@example.com",
+                is_known_contact=False, date=datetime(2026, 2, 17, 10, 0),
+            ),
+            self._make_parsed_message(
+                id="b2", from_name="Bob", from_email="bob@example.com",
+                is_known_contact=False, date=datetime(2026, 2, 17, 11, 0),
+            ),
+            self._make_parsed_message(
+                id="d1", from_name="Dan", from_email="dan@example.com",
+                is_known_contact=False, date=None,
+            ),
+        ]
+        _, body = format_day("2026-02-17", msgs)
+        order = [body.index(f"## {name}") for name in ("Dan", "Carol", "Bob")]
+        self.assertEqual(order, sorted(order))
+
+    def test_sender_order_with_aware_and_undated_messages(self):
+        def at(hour):
+            return datetime(2026, 2, 17, hour, 0, tzinfo=timezone.utc)
+
+        msgs = [
+            self._make_parsed_message(
+                id="b1", from_name="Bob", from_email="bob@example.com",
+                is_known_contact=False, date=at(11),
+            ),
+            self._make_parsed_message(
+                id="b2", from_name="Bob", from_email="bob@example.com",
+                is_known_contact=False, date=None,
+            ),
+            self._make_parsed_message(
+                id="c1", from_name="Carol", from_email="carol@example.com",
+                is_known_contact=False, date=at(10),
+            ),
+            self._make_parsed_message(
+                id="d1", from_name="Dan", from_email="dan@example.com",
+                is_known_contact=False, date=None,
+            ),
+        ]
+        _, body = format_day("2026-02-17", msgs)
+        # Bob's undated message sorts first in his bucket, so his 11:00
+        # message is still the latest and places him after Carol.
+        order = [body.index(f"## {name}") for name in ("Dan", "Carol", "Bob")]
+        self.assertEqual(order, sorted(order))
+        self.assertLess(body.index("Message ID:** b2"), body.index("Message ID:** b1"))
+
     def test_thread_organization_by_sender(self):
         msgs = [
             self._make_parsed_message(
@@ -425,12 +657,38 @@ class TestFormatDay(unittest.TestCase):
         self.assertIn("unread", body.lower())
 
 
+class _FakeBatch:
+    """Stand-in for googleapiclient's BatchHttpRequest that runs calls inline."""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        for request_id, request in self.requests:
+            try:
+                response = request.execute()
+            except Exception as exc:
+                self.callback(request_id, None, exc)
+            else:
+                self.callback(request_id, response, None)
+
+
+def _mock_service():
+    service = MagicMock()
+    service.new_batch_http_request.side_effect = lambda callback: _FakeBatch(callback)
+    return service
+
+
 class TestDeduplication(unittest.TestCase):
     """Test that messages appearing in both primary and known-contact queries are deduplicated."""
 
     def test_fetch_messages_deduplicates_by_id(self):
         """Messages that appear in both primary and contact queries should appear only once."""
-        service = MagicMock()
+        service = _mock_service()
 
         # Primary query returns msg_001 and msg_002
         primary_response = {"messages": [{"id": "msg_001"}, {"id": "msg_002"}]}
@@ -447,7 +705,7 @@ class TestDeduplication(unittest.TestCase):
         users_mock.messages.return_value = messages_mock
 
         # Mock the get() call for each unique message
-        def mock_get(userId, id, format):
+        def mock_get(userId, id, format, **params):
             mock_exec = MagicMock()
             mock_exec.execute.return_value = _make_gmail_message(
                 msg_id=id, subject=f"Subject for {id}"
@@ -467,7 +725,7 @@ class TestDeduplication(unittest.TestCase):
 
     def test_fetch_messages_no_contacts(self):
         """With no known contacts, only primary query runs."""
-        service = MagicMock()
+        service = _mock_service()
 
         primary_response = {"messages": [{"id": "msg_001"}]}
         list_mock = MagicMock()
@@ -477,7 +735,7 @@ class TestDeduplication(unittest.TestCase):
         users_mock = MagicMock()
         users_mock.messages.return_value = messages_mock
 
-        def mock_get(userId, id, format):
+        def mock_get(userId, id, format, **params):
             mock_exec = MagicMock()
             mock_exec.execute.return_value = _make_gmail_message(msg_id=id)
             return mock_exec
@@ -490,7 +748,7 @@ class TestDeduplication(unittest.TestCase):
 
     def test_fetch_messages_empty_results(self):
         """Empty API response returns no messages."""
-        service = MagicMock()
+        service = _mock_service()
 
         list_mock = MagicMock()
         list_mock.execute.return_value = {}  # No "messages" key
@@ -504,6 +762,158 @@ class TestDeduplication(unittest.TestCase):
         self.assertEqual(len(result), 0)
 
 
+class TestContactQueryChunking(unittest.TestCase):
+    """Test splitting the known-contacts from: clause under Gmail's query limit."""
+
+    def test_chunks_stay_within_limit(self):
+        emails = [f"person{i:03d}@example.com" for i in range(200)]
+        chunks = list(_chunk_emails(emails, max_len=1000))
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(len(" OR ".join(chunk)), 1000)
+        self.assertEqual([e for chunk in chunks for e in chunk], emails)
+
+    def test_small_list_is_one_chunk(self):
+        self.assertEqual(list(_chunk_emails(["a@x.com", "b@x.com"])), [["a@x.com", "b@x.com"]])
+
+    def test_oversized_address_gets_own_chunk(self):
+        long_addr = "x" * 50 + "@example.com"
+        self.assertEqual(
+            list(_chunk_emails(["a@x.com", long_addr, "b@x.com"], max_len=20)),
+            [["a@x.com"], [long_addr], ["b@x.com"]],
+        )
+
+    def test_empty(self):
+        self.assertEqual(list(_chunk_emails([])), [])
+
+    @patch("gmail._worker_http")
+    def test_fetch_messages_issues_one_query_per_chunk(self, _http):
+        service = _mock_service()
+        messages_mock = service.users.return_value.messages.return_value
+        queries = []
+
+        def mock_list(userId, q, maxResults, pageToken):
+            queries.append(q)
+            request = MagicMock()
+            request.execute.return_value = {}
+            return request
+
+        messages_mock.list.side_effect = mock_list
+        known = {f"person{i:03d}@example.com": f"Person {i}" for i in range(200)}
+        fetch_messages(service, days=1, known_contacts=known)
+
+        contact_queries = [q for q in queries if q.startswith("from:(")]
+        self.assertGreater(len(contact_queries), 1)
+        for q in contact_queries:
+            self.assertLess(len(q), 1500)
+        queried = {e for q in contact_queries for e in q[len("from:("):q.index(")")].split(" OR ")}
+        self.assertEqual(queried, set(known))
+
+
+class TestFetchFullMessages(unittest.TestCase):
+    """Test batched messages.get fetching."""
+
+    def _service(self, fail_once=()):
+        service = _mock_service()
+        messages_mock = MagicMock()
+        attempts = {}
+
+        def mock_get(userId, id, format, **params):
+            request = MagicMock()
+            attempts[id] = attempts.get(id, 0) + 1
+            if id in fail_once and attempts[id] == 1:
+                request.execute.side_effect = RuntimeError("rate limited")
+            else:
+                request.execute.return_value = _make_gmail_message(msg_id=id)
+            return request
+
+        messages_mock.get.side_effect = mock_get
+        service.users.return_value.messages.return_value = messages_mock
+        return service
+
+    @patch("gmail._worker_http")
+    def test_chunks_requests_into_batches(self, _worker_http):
+        service = self._service()
+        ids = [f"m{i}" for i in range(GET_BATCH_SIZE + 5)]
+        result = fetch_full_messages(service, ids)
+
+        self.assertEqual(service.new_batch_http_request.call_count, 2)
+        self.assertEqual([m["id"] for m in result], ids)
+
+    @patch("gmail._worker_http")
+    def test_retries_failed_batch_calls_individually(self, _worker_http):
+        service = self._service(fail_once={"m1"})
+        result = fetch_full_messages(service, ["m0", "m1", "m2"])
+        self.assertEqual([m["id"] for m in result], ["m0", "m1", "m2"])
+
+    def test_body_needed_limits_full_fetches(self):
+        service = _mock_service()
+        messages_mock = service.users.return_value.messages.return_value
+        list_request = MagicMock()
+        list_request.execute.return_value = {"messages": [{"id": "keep"}, {"id": "skip"}]}
+        messages_mock.list.return_value = list_request
+        formats = []
+
+        def mock_get(userId, id, format, **params):
+            formats.append((id, format))
+            msg = _make_gmail_message(msg_id=id, subject=id)
+            if format == "metadata":
+                msg["payload"] = {"headers": msg["payload"]["headers"]}
+            request = MagicMock()
+            request.execute.return_value = msg
+            return request
+
+        messages_mock.get.side_effect = mock_get
+        result = fetch_messages(
+            service, days=1, known_contacts={},
+            body_needed=lambda m: get_header(m, "Subject") == "keep",
+        )
+
+        self.assertEqual([m["id"] for m in result], ["keep", "skip"])
+        self.assertEqual(
+            formats, [("keep", "metadata"), ("skip", "metadata"), ("keep", "full")]
+        )
+        self.assertIn("body", result[0]["payload"])
+        self.assertNotIn("body", result[1]["payload"])
+
+    def test_body_cache_skips_known_payloads(self):
+        service = _mock_service()
+        messages_mock = service.users.return_value.messages.return_value
+        list_request = MagicMock()
+        list_request.execute.return_value = {"messages": [{"id": "old"}, {"id": "new"}]}
+        messages_mock.list.return_value = list_request
+        formats = []
+
+        def mock_get(userId, id, format, **params):
+            formats.append((id, format))
+            msg = _make_gmail_message(msg_id=id, labels=["INBOX"])
+            if format == "metadata":
+                msg["payload"] = {"headers": msg["payload"]["headers"]}
+            request = MagicMock()
+            request.execute.return_value = msg
+            return request
+
+        messages_mock.get.side_effect = mock_get
+        cached_payload = _make_gmail_message(msg_id="old", body_text="Cached body")["payload"]
+        cache = {"old": cached_payload}
+        result = fetch_messages(service, days=1, known_contacts={}, body_cache=cache)
+
+        self.assertEqual(formats, [("old", "metadata"), ("new", "metadata"), ("new", "full")])
+        self.assertEqual(parse_message(result[0], {})["body"], "Cached body")
+        # Read state comes from the fresh metadata, not the cached message
+        self.assertEqual(result[0]["labelIds"], ["INBOX"])
+        self.assertIn("new", cache)
+
+    def test_body_cache_round_trip(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "nested" / "bodies.json"
+            self.assertEqual(load_body_cache(path), {})
+            save_body_cache({"m1": {"mimeType": "text/plain"}}, path)
+            self.assertEqual(load_body_cache(path), {"m1": {"mimeType": "text/plain"}})
+            self.assertEqual(path.stat().st_mode & 0o777, 0o600)
+
+
 class TestGroupBySender(unittest.TestCase):
     """Test sender grouping logic."""
 
@@ -527,6 +937,29 @@ class TestGroupBySender(unittest.TestCase):
         self.assertEqual(dates[0], datetime(2026, 2, 17, 8, 0))
         self.assertEqual(dates[1], datetime(2026, 2, 17, 14, 0))
 
+    def test_senders_keep_first_seen_order(self):
+        msgs = [
+            {"from_email": "b@test.com", "date": datetime(2026, 2, 17, 14, 0)},
+            {"from_email": "a@test.com", "date": datetime(2026, 2, 17, 8, 0)},
+            {"from_email": "b@test.com", "date": None},
+        ]
+        grouped = group_by_sender(msgs)
+        self.assertEqual(list(grouped), ["b@test.com", "a@test.com"])
+        self.assertEqual([m["date"] for m in grouped["b@test.com"]], [None, datetime(2026, 2, 17, 14, 0)])
+
+    def test_aware_dates_mixed_with_undated_sender(self):
+        msgs = [
+            {"from_email": "a@x", "date": datetime(2026, 2, 17, 14, 0, tzinfo=timezone.utc)},
+            {"from_email": "b@x", "date": None},
+            {"from_email": "a@x", "date": datetime(2026, 2, 17, 8, 0, tzinfo=timezone.utc)},
+        ]
+        grouped = group_by_sender(msgs)
+        self.assertEqual(
+            [m["date"] for m in grouped["a@x"]],
+            [datetime(2026, 2, 17, 8, 0, tzinfo=timezone.utc), datetime(2026, 2, 17, 14, 0, tzinfo=timezone.utc)],
+        )
+        self.assertEqual([m["date"] for m in grouped["b@x"]], [None])
+
 
 if __name__ == "__main__":
     unittest.main()
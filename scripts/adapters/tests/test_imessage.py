@@ -5,17 +5,22 @@ import sys
 import unittest
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 sys.path.append(str(Path(__file__).parent.parent))
 from imessage import (
     CORE_DATA_EPOCH,
+    Message,
     convert_timestamp,
+    count_recent_messages,
     decode_attributed_body,
+    fetch_messages,
     format_day,
     group_messages_by_conversation,
     load_known_contacts,
     match_contact,
     normalize_phone,
+    open_chat_db,
 )
 
 
@@ -62,6 +67,13 @@ class TestConvertTimestamp(unittest.TestCase):
         diff = abs((from_ns - from_s).total_seconds())
         self.assertLess(diff, 1.0)
 
+    def test_nanosecond_format_keeps_subsecond_precision(self):
+        core_data_seconds = 1771325400 - CORE_DATA_EPOCH
+        whole = convert_timestamp(core_data_seconds * 1_000_000_000)
+        fractional = convert_timestamp(core_data_seconds * 1_000_000_000 + 123_456_789)
+        self.assertEqual(whole, convert_timestamp(core_data_seconds))
+        self.assertEqual((fractional - whole).microseconds, 123457)
+
     def test_none_input(self):
         self.assertIsNone(convert_timestamp(None))
 
@@ -113,6 +125,11 @@ class TestDecodeAttributedBody(unittest.TestCase):
         # Should extract the longest readable run
         self.assertIn("This is the message text", result)
 
+    def test_fallback_keeps_utf8_text_whole(self):
+        """Accented letters and emoji stay inside the printable run."""
+        blob = b"\x01\x02\x03" + "Café crème 😀 ok".encode() + b"\x00\x01hi\x00"
+        self.assertEqual(decode_attributed_body(blob), "Café crème 😀 ok")
+
     def test_filters_metadata_strings(self):
         """Known metadata strings like NSObject should be filtered in fallback strategy."""
         # Build a blob with NO NSString/NSDictionary marker so Strategy 1 is skipped,
@@ -130,16 +147,16 @@ class TestGroupMessages(unittest.TestCase):
 
     def _msg(self, handle_id="", chat_id="", is_group=False, is_from_me=False,
              chat_display_name="", text="Hello"):
-        return {
-            "handle_id": handle_id,
-            "text": text,
-            "is_from_me": is_from_me,
-            "timestamp": datetime(2026, 2, 17, 10, 0),
-            "service": "iMessage",
-            "chat_id": chat_id,
-            "chat_display_name": chat_display_name,
-            "is_group": is_group,
-        }
+        return Message(
+            handle_id=handle_id,
+            text=text,
+            is_from_me=is_from_me,
+            timestamp=datetime(2026, 2, 17, 10, 0),
+            service="iMessage",
+            chat_id=chat_id,
+            chat_display_name=chat_display_name,
+            is_group=is_group,
+        )
 
     def test_direct_messages_grouped_by_handle(self):
         contacts = {"5551234567": "Alice"}
@@ -204,6 +221,18 @@ class TestGroupMessages(unittest.TestCase):
 class TestContactMatching(unittest.TestCase):
     """Test matching handle IDs (phone numbers, emails) against profile contacts."""
 
+    def setUp(self):
+        import tempfile
+        # Keep the parsed-contacts cache out of the real home directory
+        self.cache_dir = tempfile.mkdtemp()
+        patcher = patch("lib.contact_index.CACHE_DIR", Path(self.cache_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
     def test_match_phone_number(self):
         contacts = {"5551234567": "Alice"}
         self.assertEqual(match_contact("+15551234567", contacts), "Alice")
@@ -287,6 +316,39 @@ class TestContactMatching(unittest.TestCase):
         finally:
             shutil.rmtree(tmp, ignore_errors=True)
 
+    def test_contact_cache_is_private(self):
+        import tempfile, shutil
+
+        tmp = tempfile.mkdtemp()
+        try:
+            people_dir = Path(tmp) / "profile" / "people"
+            people_dir.mkdir(parents=True)
+            (people_dir / "alice.md").write_text("---\nname: Alice\nphone: '+15551234567'\n---\n")
+
+            load_known_contacts(tmp)
+            (cache_file,) = Path(self.cache_dir).glob("contacts-*.json")
+            self.assertEqual(cache_file.stat().st_mode & 0o777, 0o600)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def test_load_contacts_skips_non_markdown(self):
+        import tempfile, shutil
+
+        tmp = tempfile.mkdtemp()
+        try:
+            people_dir = Path(tmp) / "profile" / "people"
+            people_dir.mkdir(parents=True)
+            (people_dir / "carol.md").write_text("---\nname: Carol\nphone: '+15553333333'\n---\n")
+            (people_dir / ".draft.md").write_text("---\nname: Draft\nphone: '+15554444444'\n---\n")
+            (people_dir / "notes.txt").write_text("---\nname: Notes\nphone: '+15555555555'\n---\n")
+            (people_dir / "archive.md").mkdir()
+
+            contacts = load_known_contacts(tmp)
+            # Hidden *.md files are contacts too, as they were under glob("*.md")
+            self.assertEqual(contacts, {"5553333333": "Carol", "5554444444": "Draft"})
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
 
 class TestFormatDay(unittest.TestCase):
     """Test frontmatter schema and body formatting — known vs unknown contacts."""
@@ -295,16 +357,16 @@ class TestFormatDay(unittest.TestCase):
              timestamp=None, chat_id="", chat_display_name="", is_group=False):
         if timestamp is None:
             timestamp = datetime(2026, 2, 17, 10, 30)
-        return {
-            "handle_id": handle_id,
-            "text": text,
-            "is_from_me": is_from_me,
-            "timestamp": timestamp,
-            "service": "iMessage",
-            "chat_id": chat_id,
-            "chat_display_name": chat_display_name,
-            "is_group": is_group,
-        }
+        return Message(
+            handle_id=handle_id,
+            text=text,
+            is_from_me=is_from_me,
+            timestamp=timestamp,
+            service="iMessage",
+            chat_id=chat_id,
+            chat_display_name=chat_display_name,
+            is_group=is_group,
+        )
 
     def test_frontmatter_schema(self):
         contacts = {"5551234567": "Alice"}
@@ -427,3 +489,204 @@ class TestNullTextHandling(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+def _make_chat_db(path, messages):
+    """Create a minimal chat.db with the tables fetch_messages joins.
+
+    messages: dicts with text, attributed_body, is_from_me, date (Core Data ns),
+    handle, and optional chat (chat_identifier, display_name, style).
+    """
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE handle (ROWID INTEGER PRIMARY KEY, id TEXT);
+        CREATE TABLE chat (ROWID INTEGER PRIMARY KEY, chat_identifier TEXT,
+                           display_name TEXT, style INTEGER);
+        CREATE TABLE message (ROWID INTEGER PRIMARY KEY, text TEXT, attributedBody BLOB,
+                              is_from_me INTEGER, date INTEGER,
+                              associated_message_type INTEGER DEFAULT 0,
+                              service TEXT, handle_id INTEGER);
+        CREATE TABLE chat_message_join (chat_id INTEGER, message_id INTEGER);
+    """)
+    handles: dict[str, int] = {}
+    chats: dict[tuple, int] = {}
+    for msg in messages:
+        handle_rowid = handles.get(msg["handle"])
+        if handle_rowid is None:
+            handle_rowid = conn.execute("INSERT INTO handle (id) VALUES (?)", (msg["handle"],)).lastrowid
+            handles[msg["handle"]] = handle_rowid
+        msg_rowid = conn.execute(
+            "INSERT INTO message (text, attributedBody, is_from_me, date, associated_message_type, "
+            "service, handle_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                msg.get("text"), msg.get("attributed_body"), msg.get("is_from_me", 0), msg["date"],
+                msg.get("associated_message_type", 0), msg.get("service", "iMessage"), handle_rowid,
+            ),
+        ).lastrowid
+        chat = msg.get("chat") or (msg["handle"], None, 45)
+        chat_rowid = chats.get(chat)
+        if chat_rowid is None:
+            chat_rowid = conn.execute(
+                "INSERT INTO chat (chat_identifier, display_name, style) VALUES (?, ?, ?)", chat
+            ).lastrowid
+            chats[chat] = chat_rowid
+        conn.execute("INSERT INTO chat_message_join VALUES (?, ?)", (chat_rowid, msg_rowid))
+    conn.commit()
+    conn.close()
+
+
+def _core_data_ns(dt: datetime) -> int:
+    return int((dt.timestamp() - CORE_DATA_EPOCH) * 1e9)
+
+
+class TestFetchMessages(unittest.TestCase):
+    """Test the chat.db query against a small on-disk database."""
+
+    def setUp(self):
+        import tempfile
+
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = Path(self.tmp) / "chat.db"
+        patcher = patch("imessage.CHAT_DB_PATH", self.db_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _fetch(self, messages, days=1, known_contacts=None):
+        _make_chat_db(self.db_path, messages)
+        conn = open_chat_db()
+        try:
+            return fetch_messages(conn, days, known_contacts)
+        finally:
+            conn.close()
+
+    def test_fetches_recent_messages_in_order(self):
+        now = datetime.now()
+        result = self._fetch([
+            {"text": "second", "handle": "+15551234567", "date": _core_data_ns(now - timedelta(minutes=5))},
+            {"text": "first", "handle": "+15551234567", "date": _core_data_ns(now - timedelta(minutes=10))},
+            {"text": "too old", "handle": "+15551234567", "date": _core_data_ns(now - timedelta(days=3))},
+            {"text": "a reaction", "handle": "+15551234567", "date": _core_data_ns(now),
+             "associated_message_type": 2000},
+        ])
+        self.assertEqual([m.text for m in result], ["first", "second"])
+        self.assertEqual(result[0].handle_id, "+15551234567")
+        self.assertFalse(result[0].is_group)
+
+    def test_group_chat_and_attributed_body(self):
+        now = datetime.now()
+        result = self._fetch([
+            {"text": None, "attributed_body": b"\x01\x02NSString\x05\x10From the blob\x00",
+             "handle": "friend@example.com", "date": _core_data_ns(now),
+             "chat": ("chat123", "Book Club", 43)},
+        ])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].text, "From the blob")
+        self.assertTrue(result[0].is_group)
+        self.assertEqual(result[0].chat_display_name, "Book Club")
+        self.assertEqual(result[0].chat_id, "chat123")
+
+    def test_connection_is_query_only(self):
+        _make_chat_db(self.db_path, [])
+        conn = open_chat_db()
+        try:
+            self.assertEqual(conn.execute("PRAGMA query_only").fetchone()[0], 1)
+            self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)  # MEMORY
+        finally:
+            conn.close()
+
+    def test_only_known_conversations_are_decoded(self):
+        now = datetime.now()
+        blob = b"\x01\x02NSString\x05\x10Blob text\x00"
+        messages = [
+            {"attributed_body": blob, "handle": "+15551234567", "date": _core_data_ns(now)},
+            {"attributed_body": blob, "handle": "+15559999999", "date": _core_data_ns(now)},
+            # Group chat: the stranger's message is decoded because Alice wrote too
+            {"attributed_body": blob, "handle": "stranger@example.com", "date": _core_data_ns(now),
+             "chat": ("chat-g", "", 43)},
+            {"text": "hi all", "handle": "+15551234567", "date": _core_data_ns(now),
+             "chat": ("chat-g", "", 43)},
+        ]
+        known = {"5551234567": "Alice"}
+
+        with patch("imessage.decode_attributed_body", wraps=decode_attributed_body) as decode:
+            result = self._fetch(messages, known_contacts=known)
+
+        self.assertEqual(decode.call_count, 2)
+        by_handle = {(m.handle_id, m.chat_id): m.text for m in result}
+        self.assertEqual(by_handle[("+15551234567", "+15551234567")], "Blob text")
+        self.assertEqual(by_handle[("stranger@example.com", "chat-g")], "Blob text")
+        # Unknown direct conversation is still returned for the day's counts
+        self.assertEqual(by_handle[("+15559999999", "+15559999999")], "")
+
+    def test_group_split_across_chat_rows_is_known_throughout(self):
+        now = datetime.now()
+        blob = b"\x01\x02NSString\x05\x10Blob text\x00"
+        messages = [
+            # Same group identifier, two chat rows (e.g. its SMS and iMessage halves)
+            {"attributed_body": blob, "handle": "stranger@example.com", "date": _core_data_ns(now),
+             "chat": ("chat-g", None, 43), "service": "SMS"},
+            {"text": "hi all", "handle": "+15551234567", "date": _core_data_ns(now),
+             "chat": ("chat-g", "", 43)},
+        ]
+        result = self._fetch(messages, known_contacts={"5551234567": "Alice"})
+
+        self.assertEqual([m.text for m in result], ["Blob text", "hi all"])
+        self.assertTrue(all(m.timestamp is not None for m in result))
+        known, _, unknown_messages = group_messages_by_conversation(result, {"5551234567": "Alice"})
+        self.assertEqual(list(known), ["chat-g"])
+        self.assertEqual(unknown_messages, 0)
+
+    def test_day_computed_in_sql_matches_timestamp(self):
+        sent = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+        result = self._fetch(
+            [
+                {"text": "known", "handle": "+15551234567", "date": _core_data_ns(sent)},
+                {"text": "unknown", "handle": "+15559999999", "date": _core_data_ns(sent)},
+            ],
+            days=2,
+            known_contacts={"5551234567": "Alice"},
+        )
+        known, unknown = result
+        self.assertEqual(known.day, sent.strftime("%Y-%m-%d"))
+        self.assertEqual(known.timestamp, sent)
+        self.assertEqual(unknown.day, sent.strftime("%Y-%m-%d"))
+        self.assertIsNone(unknown.timestamp)
+
+    def test_count_recent_messages(self):
+        now = datetime.now()
+        _make_chat_db(self.db_path, [
+            {"text": "new", "handle": "+15551234567", "date": _core_data_ns(now)},
+            {"text": "old", "handle": "+15551234567", "date": _core_data_ns(now - timedelta(days=5))},
+        ])
+        conn = open_chat_db()
+        try:
+            self.assertEqual(count_recent_messages(conn, 1), 1)
+            self.assertEqual(count_recent_messages(conn, 7), 2)
+        finally:
+            conn.close()
+
+    def test_message_in_two_chats_is_returned_once(self):
+        import sqlite3
+
+        _make_chat_db(self.db_path, [
+            {"text": "hello", "handle": "+15551234567", "date": _core_data_ns(datetime.now())},
+        ])
+        db = sqlite3.connect(self.db_path)
+        db.execute("INSERT INTO chat (chat_identifier, display_name, style) VALUES ('dup', NULL, 45)")
+        db.execute("INSERT INTO chat_message_join VALUES (2, 1)")
+        db.commit()
+        db.close()
+
+        conn = open_chat_db()
+        try:
+            result = fetch_messages(conn, 1)
+        finally:
+            conn.close()
+        self.assertEqual([m.chat_id for m in result], ["+15551234567"])
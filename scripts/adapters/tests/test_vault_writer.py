@@ -119,6 +119,109 @@ class TestVaultWriter(unittest.TestCase):
         self.assertEqual(list((Path(self.tmp) / "data" / "weather").glob("*.md")), [])
 
 
+class TestVaultWriterSkipUnchanged(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.writer = VaultWriter(self.tmp)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_records_content_hash(self):
+        path = self.writer.write_data_file(
+            "calendar", "d.md", {"type": "x"}, "body", skip_unchanged=True,
+        )
+        self.assertIn("content_hash:", path.read_text())
+
+    def test_unchanged_content_not_rewritten(self):
+        path = self.writer.write_data_file(
+            "calendar", "d.md", {"type": "x", "last_synced": "2026-02-21T06:00:00"}, "body",
+            skip_unchanged=True,
+        )
+        first = path.read_text()
+        self.writer.write_data_file(
+            "calendar", "d.md", {"type": "x", "last_synced": "2026-02-22T06:00:00"}, "body",
+            skip_unchanged=True,
+        )
+        self.assertEqual(path.read_text(), first)
+
+    def test_caller_volatile_keys(self):
+        def write(generated_at):
+            return self.writer.write_data_file(
+                "weather", "d.md", {"type": "x", "forecast_generated_at": generated_at}, "body",
+                skip_unchanged=True, volatile_keys={"forecast_generated_at"},
+            )
+
+        first = write("2026-02-21T06:00:00").read_text()
+        self.assertEqual(write("2026-02-21T07:00:00").read_text(), first)
+
+    def test_other_adapters_keys_are_not_volatile(self):
+        def write(generated_at):
+            return self.writer.write_data_file(
+                "calendar", "d.md", {"type": "x", "forecast_generated_at": generated_at}, "body",
+                skip_unchanged=True,
+            )
+
+        write("2026-02-21T06:00:00")
+        self.assertIn("07:00:00", write("2026-02-21T07:00:00").read_text())
+
+    def test_changed_content_rewritten(self):
+        path = self.writer.write_data_file(
+            "calendar", "d.md", {"type": "x"}, "old", skip_unchanged=True,
+        )
+        self.writer.write_data_file(
+            "calendar", "d.md", {"type": "x"}, "new", skip_unchanged=True,
+        )
+        self.assertIn("new", path.read_text())
+
+
+class TestVaultWriterBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.writer = VaultWriter(self.tmp)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_batch_defers_writes_until_exit(self):
+        with self.writer.batch():
+            path = self.writer.write_data_file("calendar", "a.md", {"type": "x"}, "a")
+            self.writer.write_data_file("calendar", "b.md", {"type": "x"}, "b")
+            self.assertFalse(path.exists())
+        self.assertIn("a", path.read_text())
+        self.assertTrue((Path(self.tmp) / "data" / "calendar" / "b.md").exists())
+
+    def test_batch_last_write_wins(self):
+        with self.writer.batch():
+            self.writer.write_data_file("test", "f.md", {"v": 1}, "old")
+            path = self.writer.write_data_file("test", "f.md", {"v": 2}, "new")
+        self.assertIn("v: 2", path.read_text())
+
+    def test_batch_discards_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.writer.batch():
+                self.writer.write_data_file("test", "f.md", {"v": 1}, "body")
+                raise RuntimeError("boom")
+        self.assertFalse((Path(self.tmp) / "data" / "test" / "f.md").exists())
+
+    def test_batch_skip_if_pending(self):
+        with self.writer.batch():
+            self.writer.write_data_file("test", "f.md", {"v": 1}, "first")
+            self.writer.write_data_file("test", "f.md", {"v": 2}, "second", overwrite=False)
+        content = (Path(self.tmp) / "data" / "test" / "f.md").read_text()
+        self.assertIn("first", content)
+
+    def test_large_batch_writes_every_file(self):
+        with self.writer.batch():
+            for i in range(40):
+                self.writer.write_data_file("calendar", f"{i:02d}.md", {"i": i}, f"day {i}")
+        data_dir = Path(self.tmp) / "data" / "calendar"
+        self.assertEqual(sorted(p.name for p in data_dir.iterdir()), [f"{i:02d}.md" for i in range(40)])
+        self.assertIn("day 39", (data_dir / "39.md").read_text())
+
+
 class TestVaultWriterUnicode(unittest.TestCase):
     def setUp(self):
         self.tmp = tempfile.mkdtemp()
@@ -1,11 +1,16 @@
 """Tests for weather.py — weather formatting and condition classification."""
 
+import os
 import sys
+import tempfile
+import time
 import unittest
 from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError
 
 sys.path.append(str(Path(__file__).parent.parent))
-from weather import simplify_condition, WMO_CODES, format_day
+from weather import simplify_condition, WMO_CODES, _forecast_cache_path, fetch_weather, format_day
 
 
 class TestSimplifyCondition(unittest.TestCase):
@@ -43,6 +48,13 @@ class TestSimplifyCondition(unittest.TestCase):
         self.assertEqual(simplify_condition(80), "rain-showers")
         self.assertEqual(simplify_condition(85), "snow-showers")
 
+    def test_every_wmo_code_matches_its_range(self):
+        for code in WMO_CODES:
+            self.assertIsInstance(simplify_condition(code), str)
+        # Codes outside the WMO table still map by range
+        self.assertEqual(simplify_condition(47), "fog")
+        self.assertEqual(simplify_condition(100), "thunderstorm")
+
 
 class TestWMOCodes(unittest.TestCase):
     def test_all_codes_have_descriptions(self):
@@ -89,6 +101,24 @@ class TestFormatDay(unittest.TestCase):
         self.assertIn("55°F", body)
         self.assertIn("38°F", body)
 
+    def test_body_layout(self):
+        daily = self.make_daily(precipitation_probability_max=[40], wind_speed_10m_max=[20.0])
+        _, body = format_day(daily, 0)
+        self.assertEqual(body, "\n".join([
+            "# Weather — 2026-02-21",
+            "",
+            "**Partly Cloudy**. High of 55°F, low of 38°F.",
+            "",
+            "Precipitation chance: 40%.",
+            "Windy — gusts up to 20 mph.",
+            "",
+            "Sunrise 06:45, sunset 17:55.",
+        ]))
+
+    def test_unknown_code_description(self):
+        _, body = format_day(self.make_daily(weather_code=[42]), 0)
+        self.assertIn("**Unknown**.", body)
+
     def test_high_wind_note(self):
         daily = self.make_daily(wind_speed_10m_max=[25.0])
         _, body = format_day(daily, 0)
@@ -118,6 +148,11 @@ class TestFormatDay(unittest.TestCase):
         self.assertIn("06:45", body)
         self.assertIn("17:55", body)
 
+    def test_missing_or_short_sun_times(self):
+        fm, _ = format_day(self.make_daily(sunrise=[None], sunset=["2026-02-21"]), 0)
+        self.assertEqual(fm["sunrise"], "")
+        self.assertEqual(fm["sunset"], "")
+
     def test_snow_condition(self):
         daily = self.make_daily(weather_code=[75])
         fm, _ = format_day(daily, 0)
@@ -125,29 +160,91 @@ class TestFormatDay(unittest.TestCase):
         self.assertEqual(fm["wmo_code"], 75)
 
 
-class TestFormatDayFinance(unittest.TestCase):
-    """Test finance adapter formatting."""
-
-    def test_weekly_summary_format(self):
-        sys.path.append(str(Path(__file__).parent.parent))
-        from finance import format_weekly_summary
-        from datetime import date
-
-        categories = [
-            {"group": "Bills", "name": "Rent", "budgeted": 1500, "activity": 1500, "balance": 0},
-            {"group": "Food", "name": "Groceries", "budgeted": 400, "activity": 450, "balance": -50},
-            {"group": "Food", "name": "Dining Out", "budgeted": 100, "activity": 50, "balance": 50},
-        ]
-
-        week_start = date(2026, 2, 16)
-        fm, body = format_weekly_summary(categories, week_start)
-
-        self.assertEqual(fm["type"], "finance-weekly")
-        self.assertEqual(fm["total_budgeted"], 2000)
-        self.assertEqual(fm["total_spent"], 2000)
-        self.assertIn("Groceries", fm["over_budget_categories"])
-        self.assertIn("OVER", body)
-        self.assertIn("Groceries", body)
+class TestForecastCache(unittest.TestCase):
+    """Test reuse of a recent Open-Meteo response."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        patcher = patch("weather.CACHE_DIR", Path(self.cache_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _urlopen(self, headers=None):
+        resp = MagicMock()
+        resp.read.return_value = b'{"daily": {"time": ["2026-02-21"]}}'
+        resp.headers = headers or {}
+        urlopen = MagicMock()
+        urlopen.return_value.__enter__.return_value = resp
+        return urlopen
+
+    def _expire_cache(self):
+        old = time.time() - 2 * 3600
+        for path in Path(self.cache_dir.name).iterdir():
+            os.utime(path, (old, old))
+
+    def test_second_fetch_uses_cache(self):
+        with patch("weather.urlopen", self._urlopen()) as urlopen:
+            first = fetch_weather(38.9, -77.0, 3)
+            second = fetch_weather(38.9, -77.0, 3)
+        self.assertEqual(urlopen.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_cache_keyed_by_location_and_days(self):
+        with patch("weather.urlopen", self._urlopen()) as urlopen:
+            fetch_weather(38.9, -77.0, 3)
+            fetch_weather(38.9, -77.0, 7)
+            fetch_weather(40.7, -74.0, 3)
+        self.assertEqual(urlopen.call_count, 3)
+
+    def test_stale_or_disabled_cache_refetches(self):
+        with patch("weather.urlopen", self._urlopen()) as urlopen:
+            fetch_weather(38.9, -77.0, 3)
+            fetch_weather(38.9, -77.0, 3, use_cache=False)
+            self.assertEqual(urlopen.call_count, 2)
+
+            self._expire_cache()
+            fetch_weather(38.9, -77.0, 3)
+            self.assertEqual(urlopen.call_count, 3)
+            # No validators were sent, so the request was unconditional
+            request = urlopen.call_args[0][0]
+            self.assertIsNone(request.get_header("If-none-match"))
+
+    def test_corrupt_cache_is_not_revalidated(self):
+        with patch("weather.urlopen", self._urlopen({"ETag": '"v1"'})):
+            fetch_weather(38.9, -77.0, 3)
+        _forecast_cache_path(38.9, -77.0, 3).write_bytes(b"{not json")
+
+        urlopen = self._urlopen()
+        with patch("weather.urlopen", urlopen):
+            data = fetch_weather(38.9, -77.0, 3)
+        self.assertEqual(data, {"daily": {"time": ["2026-02-21"]}})
+        self.assertIsNone(urlopen.call_args[0][0].get_header("If-none-match"))
+
+    def test_request_url(self):
+        urlopen = self._urlopen()
+        with patch("weather.urlopen", urlopen):
+            fetch_weather(38.9072, -77.0369, 5)
+        url = urlopen.call_args[0][0].full_url
+        self.assertTrue(url.startswith("https://api.open-meteo.com/v1/forecast?latitude=38.9072&longitude=-77.0369&"))
+        self.assertIn("&temperature_unit=fahrenheit&", url)
+        self.assertTrue(url.endswith("&forecast_days=5"))
+
+    def test_expired_cache_revalidates_with_etag(self):
+        with patch("weather.urlopen", self._urlopen({"ETag": '"v1"'})):
+            first = fetch_weather(38.9, -77.0, 3)
+        self._expire_cache()
+
+        not_modified = HTTPError("url", 304, "Not Modified", {}, None)
+        with patch("weather.urlopen", side_effect=not_modified) as urlopen:
+            second = fetch_weather(38.9, -77.0, 3)
+        self.assertEqual(second, first)
+        self.assertEqual(urlopen.call_args[0][0].get_header("If-none-match"), '"v1"')
+
+        # The revalidated copy is fresh again
+        with patch("weather.urlopen") as urlopen:
+            fetch_weather(38.9, -77.0, 3)
+        urlopen.assert_not_called()
 
 
 if __name__ == "__main__":
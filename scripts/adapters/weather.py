@@ -12,24 +12,63 @@ EXAMPLES:
     python3 scripts/adapters/weather.py
     python3 scripts/adapters/weather.py --vault ~/Documents/Achaean
     python3 scripts/adapters/weather.py --lat 38.9072 --lon -77.0369 --days 3
+    python3 scripts/adapters/weather.py --no-cache   # ignore a recent forecast
+
+DEPENDENCIES:
+    None required. Optional:
+        pip install orjson  # faster parsing of the forecast response
 """
 
+from __future__ import annotations
+
 import argparse
+import hashlib
+import logging
+import os
 import sys
 import json
+import time
 from datetime import date, datetime
 from pathlib import Path
 from urllib.request import urlopen, Request
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
 
 # Add parent to path for lib imports
 sys.path.append(str(Path(__file__).parent))
 
-from lib.vault_writer import VaultWriter
+from lib.vault_writer import VOLATILE_KEYS, VaultWriter
 from lib.sync_state import SyncState
 from lib.logging_config import setup_logging
 from lib.credentials import get_config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Raw forecast responses, reused for repeat runs within FORECAST_CACHE_TTL
+# seconds on the same day; Open-Meteo updates its models about hourly.
+CACHE_DIR = Path.home() / ".cache" / "generous-ledger"
+FORECAST_CACHE_TTL = 3600
+
+# Only the location and day count vary between requests
+_FORECAST_URL = (
+    "https://api.open-meteo.com/v1/forecast?"
+    "latitude=%s&longitude=%s"
+    "&daily=weather_code,temperature_2m_max,temperature_2m_min,"
+    "precipitation_probability_max,sunrise,sunset,wind_speed_10m_max"
+    "&temperature_unit=fahrenheit"
+    "&wind_speed_unit=mph"
+    "&timezone=auto"
+    "&forecast_days=%d"
+)
+
+# Frontmatter keys that change on every run without the forecast changing
+VOLATILE_FRONTMATTER_KEYS = VOLATILE_KEYS | {"forecast_generated_at"}
+
+# Same logger setup_logging("weather") configures in main()
+_logger = logging.getLogger("generous-ledger.weather")
+
 # Weather code descriptions (WMO codes)
 WMO_CODES = {
     0: "clear sky",
@@ -62,6 +101,9 @@ WMO_CODES = {
     99: "thunderstorm with heavy hail",
 }
 
+# Body headline per code, title-cased once instead of on every day
+_DESCRIPTIONS = {code: description.title() for code, description in WMO_CODES.items()}
+
 # Simplified condition categories for frontmatter
 def simplify_condition(code: int) -> str:
     if code <= 1:
@@ -84,31 +126,136 @@ def simplify_condition(code: int) -> str:
         return "thunderstorm"
 
 
-def fetch_weather(lat: float, lon: float, days: int = 3) -> dict:
+def _forecast_cache_path(lat: float, lon: float, days: int) -> Path:
+    key = hashlib.blake2b(f"{lat:.4f},{lon:.4f},{days}".encode("ascii"), digest_size=6).hexdigest()
+    return CACHE_DIR / f"weather-{key}.json"
+
+
+def _read_fresh_cache(path: Path) -> bytes | None:
+    """Return the cached response if it was written today and within the TTL."""
+    try:
+        mtime = path.stat().st_mtime
+        if time.time() - mtime > FORECAST_CACHE_TTL:
+            return None
+        # A forecast from yesterday starts on the wrong day
+        if date.fromtimestamp(mtime) != date.today():
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _write_cache(path: Path, raw: bytes) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(raw)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The cache is an optimization; a read-only home just disables it.
+
+
+def _read_validators(path: Path) -> dict:
+    """Return the ETag/Last-Modified stored with a cached response, if any."""
+    try:
+        validators = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return validators if isinstance(validators, dict) else {}
+
+
+def _write_validators(path: Path, validators: dict) -> None:
+    validators = {k: v for k, v in validators.items() if v}
+    if validators:
+        _write_cache(path, json.dumps(validators).encode("utf-8"))
+        return
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _parse_json(raw: bytes) -> dict:
+    # Both parsers take the bytes directly, skipping a separate decode
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def fetch_weather(lat: float, lon: float, days: int = 3, use_cache: bool = True) -> dict:
     """Fetch weather forecast from Open-Meteo API.
 
     Args:
         lat: Latitude
         lon: Longitude
         days: Number of forecast days (1-16)
+        use_cache: Reuse a response for the same location and days fetched
+            earlier today and less than FORECAST_CACHE_TTL seconds ago.
 
     Returns:
         API response dict.
     """
-    url = (
-        f"https://api.open-meteo.com/v1/forecast?"
-        f"latitude={lat}&longitude={lon}"
-        f"&daily=weather_code,temperature_2m_max,temperature_2m_min,"
-        f"precipitation_probability_max,sunrise,sunset,wind_speed_10m_max"
-        f"&temperature_unit=fahrenheit"
-        f"&wind_speed_unit=mph"
-        f"&timezone=auto"
-        f"&forecast_days={days}"
-    )
-
-    req = Request(url, headers={"User-Agent": "generous-ledger/1.0"})
-    with urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    cache_path = _forecast_cache_path(lat, lon, days)
+    cache_corrupt = False
+    if use_cache:
+        raw = _read_fresh_cache(cache_path)
+        if raw is not None:
+            try:
+                data = _parse_json(raw)
+            except ValueError:
+                # Fetch a fresh copy; revalidating would hand back the same bytes
+                cache_corrupt = True
+            else:
+                _logger.debug("Using cached forecast %s", cache_path)
+                return data
+
+    url = _FORECAST_URL % (lat, lon, days)
+
+    headers = {"User-Agent": "generous-ledger/1.0"}
+    validators_path = cache_path.with_suffix(".validators.json")
+    cached_raw = None
+    if use_cache and not cache_corrupt:
+        # Revalidate an expired copy when the server gave us validators; a
+        # 304 answer carries no body, so nothing is downloaded or re-parsed
+        # beyond the cached bytes.
+        validators = _read_validators(validators_path)
+        if validators:
+            try:
+                cached_raw = cache_path.read_bytes()
+            except OSError:
+                validators = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    req = Request(url, headers=headers)
+    try:
+        with urlopen(req, timeout=30) as resp:
+            raw = resp.read()
+            validators = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+    except HTTPError as e:
+        if e.code != 304 or cached_raw is None:
+            raise
+        _logger.debug("Forecast not modified; reusing %s", cache_path)
+        raw, validators = cached_raw, None
+
+    data = _parse_json(raw)
+    if use_cache:
+        # Rewriting also restarts the TTL for a revalidated copy
+        _write_cache(cache_path, raw)
+        if validators is not None:
+            _write_validators(validators_path, validators)
+    return data
+
+
+def _clock_time(iso_datetime: str) -> str:
+    """Return the HH:MM part of an Open-Meteo local ISO datetime, or ""."""
+    # Always YYYY-MM-DDTHH:MM, so a fixed slice avoids split()'s list
+    return iso_datetime[11:16] if iso_datetime and len(iso_datetime) >= 16 else ""
 
 
 def format_day(daily: dict, idx: int) -> tuple[dict, str]:
@@ -126,12 +273,12 @@ def format_day(daily: dict, idx: int) -> tuple[dict, str]:
     high = round(daily["temperature_2m_max"][idx])
     low = round(daily["temperature_2m_min"][idx])
     precip = daily["precipitation_probability_max"][idx]
-    sunrise = daily["sunrise"][idx].split("T")[1][:5] if daily["sunrise"][idx] else ""
-    sunset = daily["sunset"][idx].split("T")[1][:5] if daily["sunset"][idx] else ""
+    sunrise = _clock_time(daily["sunrise"][idx])
+    sunset = _clock_time(daily["sunset"][idx])
     wind = round(daily["wind_speed_10m_max"][idx])
 
     condition = simplify_condition(code)
-    description = WMO_CODES.get(code, "unknown")
+    description = _DESCRIPTIONS.get(code, "Unknown")
 
     frontmatter = {
         "type": "weather-daily",
@@ -152,7 +299,7 @@ def format_day(daily: dict, idx: int) -> tuple[dict, str]:
     body_lines = [
         f"# Weather — {date_str}",
         "",
-        f"**{description.title()}**. High of {high}°F, low of {low}°F.",
+        f"**{description}**. High of {high}°F, low of {low}°F.",
         "",
     ]
 
@@ -175,6 +322,7 @@ def main():
     parser.add_argument("--lat", type=float, default=38.9072, help="Latitude (default: DC)")
     parser.add_argument("--lon", type=float, default=-77.0369, help="Longitude (default: DC)")
     parser.add_argument("--days", type=int, default=3, help="Forecast days (default: 3)")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch a fresh forecast")
     args = parser.parse_args()
 
     logger = setup_logging("weather")
@@ -197,31 +345,39 @@ def main():
     logger.info(f"Fetching {args.days}-day forecast for ({lat}, {lon})")
 
     try:
-        data = fetch_weather(lat, lon, args.days)
+        data = fetch_weather(lat, lon, args.days, use_cache=not args.no_cache)
     except URLError as e:
         logger.error(f"Failed to fetch weather: {e}")
         sys.exit(1)
 
     daily = data["daily"]
-    files_written = 0
-
-    for i in range(len(daily["time"])):
-        frontmatter, body = format_day(daily, i)
-        date_str = daily["time"][i]
-        filename = f"{date_str}.md"
-
-        path = writer.write_data_file(
-            folder="weather",
-            filename=filename,
-            frontmatter=frontmatter,
-            body=body,
-            overwrite=True,
-        )
-        logger.info(f"Wrote {path}")
-        files_written += 1
+    filenames = []
+
+    # batch() creates data/weather once and writes every day file together
+    # when the block exits.
+    with writer.batch():
+        for i, date_str in enumerate(daily["time"]):
+            frontmatter, body = format_day(daily, i)
+            filename = f"{date_str}.md"
+
+            path = writer.write_data_file(
+                folder="weather",
+                filename=filename,
+                frontmatter=frontmatter,
+                body=body,
+                overwrite=True,
+                # forecast_generated_at changes every run, so it is left out
+                # of the hash; an unchanged forecast leaves the file (and the
+                # vault's git status) alone
+                skip_unchanged=True,
+                volatile_keys=VOLATILE_FRONTMATTER_KEYS,
+            )
+            # %-style so the message is only built when DEBUG is enabled
+            logger.debug("Prepared %s", path)
+            filenames.append(filename)
 
     state.touch_synced()
-    logger.info(f"Done. {files_written} weather files written.")
+    logger.info(f"Done. {len(filenames)} weather files up to date: {', '.join(filenames)}")
 
 
 if __name__ == "__main__":